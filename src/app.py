@@ -1,13 +1,14 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import os
-import threading
+import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 
 # Import modul lokal
 from audio_handler import AudioHandler, AudioPlayer
-from stegano import MultipleLSBSteganography, evaluate_audio_quality
+from stegano import MultipleLSBSteganography, calculate_psnr, evaluate_audio_quality
 
 
 class SteganographyApp:
@@ -28,12 +29,17 @@ class SteganographyApp:
             print(f"Could not load icon: {e}")
 
         # Initialize handlers
-        self.audio_handler = AudioHandler()
+        self.audio_handler = AudioHandler.instance()
         self.steganography = MultipleLSBSteganography()
 
-        # Initialize audio players
-        self.cover_player = AudioPlayer(on_position_change=self.update_cover_display)
-        self.stego_player = AudioPlayer(on_position_change=self.update_stego_display)
+        # Satu AudioPlayer bersama untuk cover & stego: UI tidak pernah
+        # memutar keduanya bersamaan, jadi buffer decode dan mixer ganda
+        # hanya buang memori. active_role menentukan tampilan mana yang aktif
+        self.player = AudioPlayer(
+            on_position_change=self._on_player_position, tk_root=self.root
+        )
+        self.active_role = None  # "cover" atau "stego"
+        self._stego_audio_path = None
 
         # Variables
         self.cover_file = tk.StringVar()
@@ -47,6 +53,7 @@ class SteganographyApp:
         self.show_key = tk.BooleanVar()
         self.use_encryption = tk.BooleanVar(value=True)
         self.use_random_insert = tk.BooleanVar(value=True)
+        self.show_psnr = tk.BooleanVar(value=True)
 
         # Status variables
         self.status_text = tk.StringVar(value="Ready")
@@ -57,6 +64,18 @@ class SteganographyApp:
         self.cover_duration = tk.StringVar(value="00:00 / 00:00")
         self.stego_duration = tk.StringVar(value="00:00 / 00:00")
 
+        # Pool worker persisten untuk semua job embed/extract/precache; dua
+        # worker supaya precache decode bisa overlap dengan job yang berjalan.
+        # Update Tk dari worker dimarshal lewat root.after (Tk tidak thread-safe)
+        self.executor = ThreadPoolExecutor(max_workers=2)
+
+        # Debounce label durasi player (maks ~4 Hz) dan cache teks terakhir
+        # supaya StringVar.set tidak dipanggil untuk string yang sama
+        self._last_cover_update = 0.0
+        self._last_stego_update = 0.0
+        self._last_cover_text = ""
+        self._last_stego_text = ""
+
         self.setup_gui()
 
     def setup_gui(self):
@@ -92,6 +111,17 @@ class SteganographyApp:
         notebook.add(extract_frame, text="Extract Message")
         self.setup_extract_tab(extract_frame)
 
+        # Kelompokkan tombol player lintas tab supaya update state cukup
+        # satu loop, bukan empat .config() yang ditulis berulang
+        self._cover_play_btns = [self.cover_play_btn, self.extract_cover_play_btn]
+        self._stego_play_btns = [self.stego_play_btn, self.extract_stego_play_btn]
+        self._stego_ctrl_btns = [
+            self.stego_play_btn,
+            self.stego_stop_btn,
+            self.extract_stego_play_btn,
+            self.extract_stego_stop_btn,
+        ]
+
         # Status bar
         status_frame = ttk.Frame(main_frame)
         status_frame.grid(row=2, column=0, sticky=(tk.W, tk.E), pady=(10, 0))
@@ -210,6 +240,13 @@ class SteganographyApp:
             variable=self.use_random_insert,
         ).grid(row=3, column=0, columnspan=2, sticky=tk.W, pady=2)
 
+        # PSNR checkbox (hitungannya bisa dilewati kalau tidak dibutuhkan)
+        ttk.Checkbutton(
+            options_frame,
+            text="Calculate PSNR",
+            variable=self.show_psnr,
+        ).grid(row=4, column=0, columnspan=2, sticky=tk.W, pady=2)
+
         # Audio Player frame
         player_frame = ttk.LabelFrame(parent, text="Audio Player", padding="5")
         player_frame.grid(row=row, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=5)
@@ -470,14 +507,24 @@ class SteganographyApp:
 
     def browse_cover_file(self):
         filename = filedialog.askopenfilename(
+            parent=self.root,
             title="Select Cover Audio (MP3)",
             filetypes=[("MP3 files", "*.mp3"), ("All files", "*.*")],
         )
         if filename:
             self.cover_file.set(filename)
+            # Pre-warm cache decode supaya klik Embed tidak menunggu decode
+            self.executor.submit(self._precache_audio, filename)
+
+    def _precache_audio(self, file_path):
+        try:
+            self.audio_handler.load_mp3(file_path)
+        except Exception:
+            pass
 
     def browse_secret_file(self):
         filename = filedialog.askopenfilename(
+            parent=self.root,
             title="Select Secret File",
             filetypes=[
                 ("All files", "*.*"),
@@ -491,6 +538,7 @@ class SteganographyApp:
 
     def browse_output_file(self):
         filename = filedialog.asksaveasfilename(
+            parent=self.root,
             title="Save Stego Audio As (MP3)",
             defaultextension=".mp3",
             filetypes=[("MP3 files", "*.mp3"), ("All files", "*.*")],
@@ -500,17 +548,24 @@ class SteganographyApp:
 
     def browse_stego_file(self):
         filename = filedialog.askopenfilename(
+            parent=self.root,
             title="Select Stego Audio (MP3)",
             filetypes=[("MP3 files", "*.mp3"), ("All files", "*.*")],
         )
         if filename:
             self.stego_file.set(filename)
-            # Auto-load file ke stego player jika belum ada atau berbeda
-            if self.stego_player.current_file != filename:
-                self.load_stego_audio_from_file(filename)
+            # Pre-warm cache decode untuk extract
+            self.executor.submit(self._precache_audio, filename)
+            # Auto-load file ke stego player jika belum ada atau berbeda.
+            # Load (termasuk probe durasi) jalan di worker supaya dialog
+            # file langsung kembali; update UI dimarshal balik via after
+            if self._stego_audio_path != filename:
+                self.executor.submit(self._async_load_stego, filename)
 
     def browse_extract_output(self):
-        dirname = filedialog.askdirectory(title="Select Output Directory")
+        dirname = filedialog.askdirectory(
+            parent=self.root, title="Select Output Directory"
+        )
         if dirname:
             self.extract_output.set(dirname)
 
@@ -531,102 +586,154 @@ class SteganographyApp:
             self.show_key.set(True)
 
     # Audio Player Methods
+    def _on_player_position(self, position):
+        # Dispatch callback posisi player bersama sesuai role aktif
+        if self.active_role == "cover":
+            self.update_cover_display(position)
+        elif self.active_role == "stego":
+            self.update_stego_display(position)
+
+    def _ensure_loaded(self, role, path):
+        """Pastikan path termuat di player bersama untuk role tersebut."""
+        if not path:
+            return False
+        if self.active_role == role and self.player.current_file == path:
+            return True
+        if not self.player.load(path):
+            return False
+        # Pindah role: kembalikan tampilan tombol role sebelumnya
+        if self.active_role == "cover" and role != "cover":
+            self.update_cover_button_states("▶")
+        elif self.active_role == "stego" and role != "stego":
+            self.update_stego_button_states("▶")
+        self.active_role = role
+        if role == "cover":
+            self.update_cover_duration_display(force=True)
+        else:
+            self.update_stego_duration_display(force=True)
+        return True
+
     def load_cover_audio(self):
-        if self.cover_file.get() and os.path.exists(self.cover_file.get()):
-            if self.cover_player.load(self.cover_file.get()):
-                self.update_cover_duration_display()
-                return True
-        return False
+        return self._ensure_loaded("cover", self.cover_file.get())
 
     def toggle_cover_playback(self):
-        if not self.cover_player.current_file:
-            if not self.load_cover_audio():
-                messagebox.showerror("Error", "Could not load cover audio file")
-                return
+        if not self._ensure_loaded("cover", self.cover_file.get()):
+            messagebox.showerror("Error", "Could not load cover audio file")
+            return
 
-        if self.cover_player.is_playing and not self.cover_player.is_paused:
-            if self.cover_player.pause():
+        if self.player.is_playing and not self.player.is_paused:
+            if self.player.pause():
                 self.update_cover_button_states("▶")
         else:
-            if self.cover_player.play():
+            if self.player.play():
                 self.update_cover_button_states("⏸")
 
     def stop_cover_playback(self):
-        if self.cover_player.stop():
+        if self.active_role == "cover" and self.player.stop():
             self.update_cover_button_states("▶")
 
     def update_cover_display(self, position):
         self.update_cover_duration_display()
 
-    def update_cover_duration_display(self):
-        current = self.cover_player.get_position()
-        total = self.cover_player.get_duration()
+    def update_cover_duration_display(self, force=False):
+        if self.active_role != "cover":
+            return
+        now = time.monotonic()
+        if not force and now - self._last_cover_update < 0.25:
+            return
+        self._last_cover_update = now
 
-        current_str = self.format_time(current)
-        total_str = self.format_time(total)
+        current_str = self.format_time(self.player.get_position())
+        total_str = self.format_time(self.player.get_duration())
 
-        self.cover_duration.set(f"{current_str} / {total_str}")
+        new_text = f"{current_str} / {total_str}"
+        if new_text != self._last_cover_text:
+            self._last_cover_text = new_text
+            self.cover_duration.set(new_text)
 
     def toggle_stego_playback(self):
-        if not self.stego_player.current_file:
-            if not self.load_stego_audio():
-                messagebox.showerror("Error", "Could not load stego audio file")
-                return
+        path = self._stego_audio_path or self.output_file.get()
+        if not self._ensure_loaded("stego", path):
+            messagebox.showerror("Error", "Could not load stego audio file")
+            return
+        self._stego_audio_path = path
 
-        if self.stego_player.is_playing and not self.stego_player.is_paused:
-            if self.stego_player.pause():
+        if self.player.is_playing and not self.player.is_paused:
+            if self.player.pause():
                 self.update_stego_button_states("▶")
         else:
-            if self.stego_player.play():
+            if self.player.play():
                 self.update_stego_button_states("⏸")
 
     def stop_stego_playback(self):
-        if self.stego_player.stop():
+        if self.active_role == "stego" and self.player.stop():
             self.update_stego_button_states("▶")
 
     def load_stego_audio(self):
-        if self.output_file.get() and os.path.exists(self.output_file.get()):
-            if self.stego_player.load(self.output_file.get()):
-                self.update_stego_duration_display()
-                # Enable stego player controls di kedua tab
-                self.stego_play_btn.config(state="normal")
-                self.stego_stop_btn.config(state="normal")
-                self.extract_stego_play_btn.config(state="normal")
-                self.extract_stego_stop_btn.config(state="normal")
-                return True
+        # Tidak perlu os.path.exists di sini; player.load sudah menangani
+        # file hilang dan mengembalikan False
+        path = self.output_file.get()
+        if path and self._ensure_loaded("stego", path):
+            self._stego_audio_path = path
+            # Enable stego player controls di kedua tab
+            self._set_stego_controls_state("normal")
+            return True
         return False
 
     def update_stego_display(self, position):
         self.update_stego_duration_display()
 
-    def update_stego_duration_display(self):
-        current = self.stego_player.get_position()
-        total = self.stego_player.get_duration()
+    def update_stego_duration_display(self, force=False):
+        if self.active_role != "stego":
+            return
+        now = time.monotonic()
+        if not force and now - self._last_stego_update < 0.25:
+            return
+        self._last_stego_update = now
 
-        current_str = self.format_time(current)
-        total_str = self.format_time(total)
+        current_str = self.format_time(self.player.get_position())
+        total_str = self.format_time(self.player.get_duration())
 
-        self.stego_duration.set(f"{current_str} / {total_str}")
+        new_text = f"{current_str} / {total_str}"
+        if new_text != self._last_stego_text:
+            self._last_stego_text = new_text
+            self.stego_duration.set(new_text)
+
+    def _async_load_stego(self, file_path):
+        try:
+            ok = self.player.load(file_path)
+        except Exception:
+            ok = False
+        if ok:
+            self.root.after(0, self._on_stego_loaded, file_path)
+
+    def _on_stego_loaded(self, file_path):
+        if self.active_role == "cover":
+            self.update_cover_button_states("▶")
+        self.active_role = "stego"
+        self._stego_audio_path = file_path
+        self.update_stego_duration_display(force=True)
+        self._set_stego_controls_state("normal")
 
     def load_stego_audio_from_file(self, file_path):
-        if file_path and os.path.exists(file_path):
-            if self.stego_player.load(file_path):
-                self.update_stego_duration_display()
-                # Enable stego player controls di kedua tab
-                self.stego_play_btn.config(state="normal")
-                self.stego_stop_btn.config(state="normal")
-                self.extract_stego_play_btn.config(state="normal")
-                self.extract_stego_stop_btn.config(state="normal")
-                return True
+        if file_path and self._ensure_loaded("stego", file_path):
+            self._stego_audio_path = file_path
+            # Enable stego player controls di kedua tab
+            self._set_stego_controls_state("normal")
+            return True
         return False
 
     def update_cover_button_states(self, text):
-        self.cover_play_btn.config(text=text)
-        self.extract_cover_play_btn.config(text=text)
+        for btn in self._cover_play_btns:
+            btn.config(text=text)
 
     def update_stego_button_states(self, text):
-        self.stego_play_btn.config(text=text)
-        self.extract_stego_play_btn.config(text=text)
+        for btn in self._stego_play_btns:
+            btn.config(text=text)
+
+    def _set_stego_controls_state(self, state):
+        for btn in self._stego_ctrl_btns:
+            btn.config(state=state)
 
     def format_time(self, seconds):
         minutes = int(seconds // 60)
@@ -634,28 +741,45 @@ class SteganographyApp:
         return f"{minutes:02d}:{seconds:02d}"
 
     def update_progress(self, value, status="Processing..."):
+        # Boleh dipanggil dari worker thread; eksekusi di Tk main loop
+        self.root.after(0, self._apply_progress, value, status)
+
+    def _apply_progress(self, value, status):
+        # Sudah berjalan di Tk main loop (via after); cukup set variable,
+        # mainloop sendiri yang repaint — tanpa update_idletasks eksplisit
         self.progress_var.set(value)
         self.status_text.set(status)
-        self.root.update_idletasks()
 
     def embed_message(self):
+        # Snapshot semua nilai widget sekali di main thread; tiap .get()
+        # adalah round-trip ke interpreter Tcl, dan snapshot mencegah race
+        # kalau user mengubah widget saat worker berjalan
+        params = {
+            "cover": self.cover_file.get(),
+            "secret": self.secret_file.get(),
+            "output": self.output_file.get(),
+            "key": self.key.get(),
+            "n_lsb": self.n_lsb.get(),
+            "encrypt": self.use_encryption.get(),
+            "random_start": self.use_random_insert.get(),
+            "show_psnr": self.show_psnr.get(),
+        }
+
         # Validasi input
-        if not self.cover_file.get():
+        if not params["cover"]:
             messagebox.showerror("Error", "Please select cover audio file")
             return
 
-        if not self.secret_file.get():
+        if not params["secret"]:
             messagebox.showerror("Error", "Please select secret file")
             return
 
-        if not self.output_file.get():
+        if not params["output"]:
             messagebox.showerror("Error", "Please specify output file")
             return
 
         # Key is required only if encryption or random insert is enabled
-        if (
-            self.use_encryption.get() or self.use_random_insert.get()
-        ) and not self.key.get():
+        if (params["encrypt"] or params["random_start"]) and not params["key"]:
             messagebox.showerror(
                 "Error", "Please enter key for encryption and/or random placement"
             )
@@ -664,54 +788,57 @@ class SteganographyApp:
         # Run embedding in separate thread
         def embed_worker():
             try:
-                self.update_progress(20, "Loading secret file...")
+                self.update_progress(20, "Checking secret file...")
 
-                # Load secret file
-                with open(self.secret_file.get(), "rb") as f:
-                    secret_data = f.read()
+                # Jangan baca seluruh secret file di sini; embed_file membaca
+                # sendiri dari path-nya. Cukup validasi bahwa file ada.
+                if not os.path.exists(params["secret"]):
+                    raise FileNotFoundError(
+                        f"Secret file tidak ditemukan: {params['secret']}"
+                    )
 
                 self.update_progress(30, "Embedding message...")
 
-                # Use the unified key for both encryption and random placement
-                unified_key = self.key.get()
-
                 # Embed directly into MP3 file (metadata-preserving)
                 self.steganography.embed_file(
-                    mp3_path=self.cover_file.get(),
-                    payload_path=self.secret_file.get(),
-                    out_path=self.output_file.get(),
-                    key=unified_key,
-                    nlsb=self.n_lsb.get(),
-                    encrypt=self.use_encryption.get(),
-                    random_start=self.use_random_insert.get(),
+                    mp3_path=params["cover"],
+                    payload_path=params["secret"],
+                    out_path=params["output"],
+                    key=params["key"],
+                    nlsb=params["n_lsb"],
+                    encrypt=params["encrypt"],
+                    random_start=params["random_start"],
                 )
 
-                self.update_progress(70, "Calculating PSNR...")
-
-                # Calculate PSNR on MP3 bytes
-                with open(self.cover_file.get(), "rb") as f:
-                    original_bytes = f.read()
-                with open(self.output_file.get(), "rb") as f:
-                    stego_bytes = f.read()
-                L = min(len(original_bytes), len(stego_bytes))
-                if L == 0:
-                    psnr = float("inf")
+                if params["show_psnr"]:
+                    self.update_progress(70, "Calculating PSNR...")
+
+                    # Calculate PSNR on MP3 bytes
+                    with open(params["cover"], "rb") as f:
+                        original_bytes = f.read()
+                    with open(params["output"], "rb") as f:
+                        stego_bytes = f.read()
+                    L = min(len(original_bytes), len(stego_bytes))
+                    if L == 0:
+                        psnr = float("inf")
+                    else:
+                        # Biarkan array tetap integer; konversi float difusikan
+                        # di calculate_psnr (tanpa buffer float64 perantara)
+                        psnr = calculate_psnr(
+                            np.frombuffer(original_bytes, dtype=np.uint8, count=L),
+                            np.frombuffer(stego_bytes, dtype=np.uint8, count=L),
+                        )
+                    quality = evaluate_audio_quality(psnr)
+                    psnr_line = f"PSNR: {psnr:.2f} dB ({quality})"
                 else:
-                    diff = np.frombuffer(original_bytes[:L], dtype=np.uint8).astype(
-                        np.int32
-                    ) - np.frombuffer(stego_bytes[:L], dtype=np.uint8).astype(np.int32)
-                    mse = float(np.mean(diff * diff)) if L > 0 else 0.0
-                    psnr = (
-                        float("inf")
-                        if mse == 0
-                        else 10.0 * np.log10((255.0 * 255.0) / mse)
-                    )
-                quality = evaluate_audio_quality(psnr)
+                    # Hasilnya hanya tampil di status bar; lewati kalau user
+                    # tidak membutuhkannya
+                    psnr_line = "PSNR: (skipped)"
 
                 self.update_progress(90, "Finalizing...")
 
                 self.update_progress(100, "Embedding completed!")
-                self.psnr_text.set(f"PSNR: {psnr:.2f} dB ({quality})")
+                self.psnr_text.set(psnr_line)
 
                 # Load stego audio ke player setelah berhasil disave
                 self.load_stego_audio()
@@ -719,8 +846,8 @@ class SteganographyApp:
                 messagebox.showinfo(
                     "Success",
                     f"Message embedded successfully!\n"
-                    f"PSNR: {psnr:.2f} dB ({quality})\n"
-                    f"Output: {self.output_file.get()}",
+                    f"{psnr_line}\n"
+                    f"Output: {params['output']}",
                 )
 
             except Exception as e:
@@ -728,25 +855,30 @@ class SteganographyApp:
                 messagebox.showerror("Error", f"Embedding failed:\n{str(e)}")
                 print(f"Embedding error: {traceback.format_exc()}")
 
-        # Start embedding in background thread
-        thread = threading.Thread(target=embed_worker)
-        thread.daemon = True
-        thread.start()
+        # Submit ke pool worker persisten
+        self.executor.submit(embed_worker)
 
     def extract_message(self):
+        # Snapshot nilai widget sekali di main thread (lihat embed_message)
+        params = {
+            "stego": self.stego_file.get(),
+            "out_dir": self.extract_output.get(),
+            "key": self.key.get(),
+            "encrypt": self.use_encryption.get(),
+            "random_start": self.use_random_insert.get(),
+        }
+
         # Validasi input
-        if not self.stego_file.get():
+        if not params["stego"]:
             messagebox.showerror("Error", "Please select stego audio file")
             return
 
-        if not self.extract_output.get():
+        if not params["out_dir"]:
             messagebox.showerror("Error", "Please specify output directory")
             return
 
         # Key is required only if encryption or random insert is enabled
-        if (
-            self.use_encryption.get() or self.use_random_insert.get()
-        ) and not self.key.get():
+        if (params["encrypt"] or params["random_start"]) and not params["key"]:
             messagebox.showerror(
                 "Error", "Please enter key for decryption and/or random placement"
             )
@@ -757,21 +889,20 @@ class SteganographyApp:
             try:
                 self.update_progress(10, "Loading stego audio...")
 
-                # Load stego audio
-                self.audio_handler.load_mp3(self.stego_file.get())
+                # Ekstraksi membaca byte kontainer langsung; decode PCM hanya
+                # dibutuhkan player, jadi warm cache-nya paralel di worker
+                # kedua alih-alih memblokir ekstraksi
+                self.executor.submit(self._precache_audio, params["stego"])
 
                 self.update_progress(30, "Extracting message...")
 
-                # Use the unified key for both decryption and random placement
-                unified_key = self.key.get()
-
                 # Extract message (always use decryption and random placement)
                 # Extract directly from MP3 file
                 extracted_path, size_bytes, extract_status = (
                     self.steganography.extract_file(
-                        mp3_path=self.stego_file.get(),
-                        out_path=self.extract_output.get(),
-                        key=unified_key,
+                        mp3_path=params["stego"],
+                        out_path=params["out_dir"],
+                        key=params["key"],
                         restore_meta=True,
                     )
                 )
@@ -794,10 +925,8 @@ class SteganographyApp:
                 messagebox.showerror("Error", f"Extraction failed:\n{str(e)}")
                 print(f"Extraction error: {traceback.format_exc()}")
 
-        # Start extraction in background thread
-        thread = threading.Thread(target=extract_worker)
-        thread.daemon = True
-        thread.start()
+        # Submit ke pool worker persisten
+        self.executor.submit(extract_worker)
 
     def run(self):
         # Setup cleanup when window is closed
@@ -806,9 +935,8 @@ class SteganographyApp:
 
     def on_closing(self):
         try:
-            # Cleanup audio players
-            self.cover_player.cleanup()
-            self.stego_player.cleanup()
+            # Cleanup audio player bersama
+            self.player.cleanup()
         except:
             pass
         finally:
@@ -1,13 +1,284 @@
+import array
+import json
 import numpy as np
 import os
+import shutil
 import subprocess
+import sys
+import tempfile
 import threading
 import time
-from typing import Tuple, Optional, Callable
+import weakref
+from functools import lru_cache
+from typing import List, Tuple, Optional, Callable
 import pygame
 
+try:
+    # Numba opsional: generator nada dikompilasi jadi satu pass paralel
+    # yang menulis int16 langsung, tanpa temporari float sama sekali
+    import math as _math
+
+    import numba
+
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _tone_kernel(n, frequency, sample_rate, out):  # pragma: no cover - butuh numba terinstall
+        w = 2.0 * _math.pi * frequency / sample_rate
+        for i in numba.prange(n):
+            out[i] = np.int16(16000.0 * _math.sin(w * i))
+
+except ImportError:
+    _tone_kernel = None
+
+try:
+    # PyAV opsional: decode in-process lewat libav, tanpa fork+exec ffmpeg
+    # per file — menguntungkan alur yang memuat banyak file beruntun
+    import av
+except ImportError:
+    av = None
+
+
+# Resolusi path sekali saat import: tiap spawn berikutnya langsung exec
+# path absolut tanpa PATH walk, dan None sekaligus jadi cek ketersediaan
+_FFMPEG = shutil.which("ffmpeg")
+_FFPROBE = shutil.which("ffprobe")
+
+# Batasi thread ffmpeg: setengah core cukup untuk decode/encode audio dan
+# menyisakan CPU untuk worker embed/extract yang berjalan bersamaan
+_FFMPEG_THREADS = str(max(1, (os.cpu_count() or 2) // 2))
+
+# Flag standar semua invokasi ffmpeg: tanpa banner, tanpa probing stdin
+# (pipe stdin dipakai eksplisit saat encode), stderr hanya berisi error
+_FFMPEG_BASE_FLAGS = [
+    "-hide_banner",
+    "-nostdin",
+    "-loglevel",
+    "error",
+    "-threads",
+    _FFMPEG_THREADS,
+]
+
+
+def _probe_duration(file_path: str) -> Optional[float]:
+    # Tanya durasi ke ffprobe (baca header saja) untuk prealokasi buffer PCM
+    try:
+        result = subprocess.run(
+            [
+                _FFPROBE,
+                "-v",
+                "error",
+                "-show_entries",
+                "format=duration",
+                "-of",
+                "default=noprint_wrappers=1:nokey=1",
+                file_path,
+            ],
+            capture_output=True,
+            check=True,
+        )
+        return float(result.stdout.strip())
+    except Exception:
+        return None
+
+
+def create_dummy_audio(
+    duration_seconds: float = 1.0,
+    frequency: float = 440.0,
+    sample_rate: int = 44100,
+) -> Tuple[np.ndarray, int]:
+    # Nada sinus int16 untuk uji coba tanpa file MP3 sungguhan
+    n = int(sample_rate * duration_seconds)
+    if _tone_kernel is not None:
+        samples = np.empty(n, dtype=np.int16)
+        _tone_kernel(n, float(frequency), float(sample_rate), samples)
+        return samples, sample_rate
+    # Fallback NumPy: fase float32 dan sin in-place (out=) supaya hanya ada
+    # satu buffer temporari, bukan tiga float64 seukuran audio
+    phase = (2.0 * np.pi * frequency / sample_rate) * np.arange(
+        n, dtype=np.float32
+    )
+    samples = (np.sin(phase, out=phase) * 16000).astype(np.int16)
+    return samples, sample_rate
+
+
+# Di atas ambang ini PCM tidak ditahan di RAM melainkan di file temp yang
+# di-memmap; akses LSB yang sekuensial tetap hangat di page cache
+_PCM_MEMMAP_THRESHOLD = 50 * 1024 * 1024
+
+
+def _remove_quiet(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _decode_mp3_av(file_path: str) -> Tuple[np.ndarray, int]:
+    # Decode + resample mono/44100 lewat libav di proses ini sendiri
+    container = av.open(file_path)
+    try:
+        stream = container.streams.audio[0]
+        resampler = av.AudioResampler(format="s16", layout="mono", rate=44100)
+        chunks = []
+        for frame in container.decode(stream):
+            for out in resampler.resample(frame):
+                chunks.append(out.to_ndarray().reshape(-1))
+        for out in resampler.resample(None):  # flush sisa resampler
+            chunks.append(out.to_ndarray().reshape(-1))
+    finally:
+        container.close()
+    if not chunks:
+        return np.empty(0, dtype=np.int16), 44100
+    return np.concatenate(chunks).astype(np.int16, copy=False), 44100
+
+
+def _decode_mp3_to_memmap(cmd) -> np.ndarray:
+    # PCM sangat besar: arahkan stdout ffmpeg langsung ke file temp lalu
+    # memmap read-only — RAM puncak dibatasi page cache, bukan ukuran PCM,
+    # dan file > RAM tetap bisa diproses
+    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".pcm")
+    try:
+        with tmp:
+            subprocess.run(
+                cmd, stdout=tmp, stderr=subprocess.DEVNULL, check=True
+            )
+        n = os.path.getsize(tmp.name) // 2
+        samples = np.memmap(tmp.name, dtype=np.int16, mode="r", shape=(n,))
+        # File temp ikut mati bersama array (termasuk saat entri cache LRU
+        # tergusur)
+        weakref.finalize(samples, _remove_quiet, tmp.name)
+        return samples
+    except Exception:
+        _remove_quiet(tmp.name)
+        raise
+
+
+def _check_ffmpeg() -> bool:
+    # shutil.which saat import sudah menjawab ketersediaan; tanpa spawn
+    # subprocess ffmpeg -version sama sekali
+    return _FFMPEG is not None
+
+
+@lru_cache(maxsize=16)
+def _probe_info_cached(file_path: str, mtime_ns: int, size: int) -> dict:
+    # mtime_ns/size hanya bagian kunci cache; entri basi gugur sendiri saat
+    # file berubah
+    result = subprocess.run(
+        [
+            _FFPROBE,
+            "-v",
+            "error",
+            "-print_format",
+            "json",
+            "-show_format",
+            "-show_streams",
+            file_path,
+        ],
+        capture_output=True,
+        check=True,
+    )
+    return json.loads(result.stdout)
+
+
+@lru_cache(maxsize=4)
+def _decode_mp3_cached(file_path: str, mtime_ns: int, size: int) -> Tuple[np.ndarray, int]:
+    # Cache level modul supaya hasil decode shared antara player dan worker
+    # embed/extract. mtime_ns/size hanya dipakai sebagai bagian kunci cache.
+    try:
+        # Konversi MP3 ke raw PCM menggunakan ffmpeg
+        cmd = [
+            _FFMPEG,
+            *_FFMPEG_BASE_FLAGS,
+            "-i",
+            file_path,
+            "-ac",
+            "1",  # mono
+            "-ar",
+            "44100",  # sample rate 44.1kHz
+            "-f",
+            "s16le",  # format: signed 16-bit little endian
+            "-",  # output ke stdout
+        ]
+
+        # Stream PCM langsung ke buffer yang dipre-alokasi dari estimasi
+        # durasi ffprobe (+1 detik slack) — tanpa bytes perantara seukuran
+        # audio seperti pada capture_output
+        est = _probe_duration(file_path)
+        if est is not None:
+            cap = (int(est * 44100) + 44100) * 2
+            # memmap membaca s16le apa adanya, jadi jalur ini khusus host
+            # little-endian (praktisnya semua target aplikasi ini)
+            if cap > _PCM_MEMMAP_THRESHOLD and sys.byteorder == "little":
+                return _decode_mp3_to_memmap(cmd), 44100
+        else:
+            cap = 1 << 22
+
+        if av is not None:
+            return _decode_mp3_av(file_path)
+        buf = bytearray(cap)
+        off = 0
+
+        proc = subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=0
+        )
+
+        # Kuras stderr paralel: kalau ffmpeg sempat menulis > 64 KiB log
+        # sebelum stdout selesai, pipe stderr penuh dan decoder macet
+        err_buf = bytearray()
+        drain = threading.Thread(
+            target=lambda: err_buf.extend(proc.stderr.read()), daemon=True
+        )
+        drain.start()
+
+        while True:
+            if off == len(buf):
+                buf += bytes(max(len(buf) // 2, 1 << 20))
+            mv = memoryview(buf)
+            n = proc.stdout.readinto(mv[off:])
+            mv.release()
+            if not n:
+                break
+            off += n
+        ret = proc.wait()
+        drain.join()
+        if ret != 0:
+            raise subprocess.CalledProcessError(
+                ret, cmd, stderr=bytes(err_buf)
+            )
+
+        off -= off % 2  # jaga kelipatan ukuran sampel int16
+
+        # Hasil decode ditahan lama oleh cache LRU; kalau slack estimasi
+        # ffprobe besar, kompaksi dulu supaya cache tidak memegang buffer
+        # yang jauh lebih besar dari PCM aslinya
+        if len(buf) - off > (1 << 20):
+            buf = bytes(memoryview(buf)[:off])
+            pcm = memoryview(buf)
+        else:
+            pcm = memoryview(buf)[:off]
+
+        # Konversi raw PCM data ke numpy array
+        if sys.byteorder == "big":
+            # ffmpeg mengeluarkan s16le; di host big-endian swap in-place
+            # via array.byteswap (loop C native), lalu view tanpa salinan
+            swapped = array.array("h")
+            swapped.frombytes(pcm)
+            swapped.byteswap()
+            samples = np.frombuffer(swapped, dtype=np.int16)
+        else:
+            samples = np.frombuffer(pcm, dtype=np.int16)
+        sample_rate = 44100  # Fixed sample rate
+
+        return samples, sample_rate
+
+    except subprocess.CalledProcessError as e:
+        raise ValueError(f"Gagal load MP3: {e}")
+    except Exception as e:
+        raise ValueError(f"Gagal load audio: {str(e)}")
+
 
 class AudioHandler:
+    _instance = None
+
     def __init__(self):
         # Cek apakah ffmpeg tersedia (wajib untuk MP3)
         self.ffmpeg_available = self._check_ffmpeg()
@@ -16,64 +287,92 @@ class AudioHandler:
                 "FFmpeg diperlukan untuk menangani file MP3. Silakan install FFmpeg terlebih dahulu."
             )
 
+    @classmethod
+    def instance(cls) -> "AudioHandler":
+        # Handler stateless; pakai satu instance bersama daripada membayar
+        # konstruksi (dan dulunya cek ffmpeg) di tiap pemanggil
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
     def _check_ffmpeg(self) -> bool:
-        try:
-            subprocess.run(["ffmpeg", "-version"], capture_output=True, check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+        return _check_ffmpeg()
 
     def load_mp3(self, file_path: str) -> Tuple[np.ndarray, int]:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File tidak ditemukan: {file_path}")
 
-        try:
-            # Konversi MP3 ke raw PCM menggunakan ffmpeg
-            cmd = [
-                "ffmpeg",
-                "-i",
-                file_path,
-                "-ac",
-                "1",  # mono
-                "-ar",
-                "44100",  # sample rate 44.1kHz
-                "-f",
-                "s16le",  # format: signed 16-bit little endian
-                "-",  # output ke stdout
-            ]
-
-            result = subprocess.run(cmd, capture_output=True, check=True)
-
-            # Konversi raw PCM data ke numpy array
-            samples = np.frombuffer(result.stdout, dtype=np.int16)
-            sample_rate = 44100  # Fixed sample rate
+        st = os.stat(file_path)
+        return _decode_mp3_cached(file_path, st.st_mtime_ns, st.st_size)
+
+    def load_mp3_partial(
+        self,
+        file_path: str,
+        max_seconds: Optional[float] = None,
+        start_seconds: float = 0.0,
+    ) -> Tuple[np.ndarray, int]:
+        # Decode hanya potongan [start, start+max] — kerja dibatasi konstanta,
+        # bukan panjang file; cocok untuk preview/probe tanpa decode penuh
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File tidak ditemukan: {file_path}")
 
-            return samples, sample_rate
+        cmd = [_FFMPEG, *_FFMPEG_BASE_FLAGS]
+        if start_seconds > 0:
+            # -ss sebelum -i: seek di level demuxer, tanpa decode prefix
+            cmd += ["-ss", str(start_seconds)]
+        cmd += ["-i", file_path]
+        if max_seconds is not None:
+            cmd += ["-t", str(max_seconds)]
+        cmd += ["-ac", "1", "-ar", "44100", "-f", "s16le", "-"]
 
+        try:
+            # Output dibatasi max_seconds; capture_output cukup di sini
+            result = subprocess.run(cmd, capture_output=True, check=True)
+            pcm = result.stdout[: len(result.stdout) - (len(result.stdout) % 2)]
+            return np.frombuffer(pcm, dtype=np.int16), 44100
         except subprocess.CalledProcessError as e:
             raise ValueError(f"Gagal load MP3: {e}")
-        except Exception as e:
-            raise ValueError(f"Gagal load audio: {str(e)}")
+
+    def _probe(self, file_path: str) -> dict:
+        # Baca metadata container lewat ffprobe (header saja, tanpa decode);
+        # hasilnya di-cache dengan kunci (path, mtime, size) seperti cache
+        # decode, supaya load ulang file yang sama tidak spawn ffprobe lagi
+        st = os.stat(file_path)
+        return _probe_info_cached(file_path, st.st_mtime_ns, st.st_size)
 
     def get_audio_info(self, file_path: str) -> dict:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File tidak ditemukan: {file_path}")
 
         try:
-            # Load untuk mendapatkan info
-            samples, sample_rate = self.load_mp3(file_path)
-            duration_seconds = len(samples) / sample_rate
+            probed = self._probe(file_path)
+            fmt = probed.get("format", {})
+            stream = next(
+                (
+                    s
+                    for s in probed.get("streams", [])
+                    if s.get("codec_type") == "audio"
+                ),
+                {},
+            )
+
+            duration_seconds = float(
+                fmt.get("duration") or stream.get("duration") or 0.0
+            )
+            sample_rate = int(stream.get("sample_rate") or 44100)
+            sample_count = int(duration_seconds * sample_rate)
+            bitrate = fmt.get("bit_rate")
 
             info = {
                 "duration_seconds": duration_seconds,
                 "duration_ms": duration_seconds * 1000,
                 "sample_rate": sample_rate,
-                "channels": 1,  # Selalu dikonversi ke mono
-                "sample_width": 2,  # Selalu 16-bit
-                "frame_count": len(samples),
-                "sample_count": len(samples),
-                "bitrate": None,
-                "format": "mp3",
+                "channels": int(stream.get("channels") or 1),
+                "sample_width": 2,  # playback path selalu decode ke 16-bit
+                "frame_count": sample_count,
+                "sample_count": sample_count,
+                "bitrate": int(bitrate) if bitrate else None,
+                "format": fmt.get("format_name", "mp3"),
             }
 
             return info
@@ -81,10 +380,186 @@ class AudioHandler:
         except Exception as e:
             raise ValueError(f"Gagal get audio info: {str(e)}")
 
+    def save_mp3(
+        self,
+        samples: np.ndarray,
+        sample_rate: int,
+        output_path: str,
+        source_path: Optional[str] = None,
+    ) -> str:
+        # Fast path "save as" tanpa edit: kalau sampel identik dengan hasil
+        # decode file sumber, salin stream-nya (-c copy) tanpa re-encode lame
+        if source_path is not None and os.path.exists(source_path):
+            try:
+                src_samples, src_sr = self.load_mp3(source_path)
+                if (
+                    src_sr == sample_rate
+                    and samples.dtype == src_samples.dtype
+                    and np.array_equal(samples, src_samples)
+                ):
+                    subprocess.run(
+                        [
+                            _FFMPEG,
+                            *_FFMPEG_BASE_FLAGS,
+                            "-y",
+                            "-i",
+                            source_path,
+                            "-c:a",
+                            "copy",
+                            output_path,
+                        ],
+                        capture_output=True,
+                        check=True,
+                    )
+                    return output_path
+            except Exception:
+                pass  # fallback ke jalur encode biasa
+
+        # Encode PCM int16 langsung ke MP3 lewat stdin pipe ffmpeg — tanpa
+        # WAV perantara di disk (hemat satu write+read seukuran audio)
+        if samples.dtype != np.int16:
+            # Clamp ke rentang int16 dalam satu pass ke buffer tujuan;
+            # astype polos wrap-around pada nilai di luar rentang
+            clipped = np.empty(samples.shape, dtype=np.int16)
+            np.clip(samples, -32768, 32767, out=clipped, casting="unsafe")
+            samples = clipped
+
+        cmd = [
+            _FFMPEG,
+            *_FFMPEG_BASE_FLAGS,
+            "-y",
+            "-f",
+            "s16le",
+            "-ar",
+            str(sample_rate),
+            "-ac",
+            "1",
+            "-i",
+            "pipe:0",
+            "-codec:a",
+            "libmp3lame",
+            "-q:a",
+            "2",
+            output_path,
+        ]
+
+        try:
+            self._encode_from_stdin(cmd, samples)
+            return output_path
+        except Exception as e:
+            raise ValueError(f"Gagal save MP3: {str(e)}")
+
+    def save_mp3_multi(
+        self,
+        samples: np.ndarray,
+        sample_rate: int,
+        outputs: List[Tuple[str, int]],
+    ) -> List[str]:
+        # Beberapa output (path, kualitas -q:a) dari satu proses ffmpeg dan
+        # satu feed PCM — amortisasi init LAME + decode stdin dibanding
+        # loop save_mp3 per output
+        if not outputs:
+            return []
+        if samples.dtype != np.int16:
+            clipped = np.empty(samples.shape, dtype=np.int16)
+            np.clip(samples, -32768, 32767, out=clipped, casting="unsafe")
+            samples = clipped
+
+        cmd = [
+            _FFMPEG,
+            *_FFMPEG_BASE_FLAGS,
+            "-y",
+            "-f",
+            "s16le",
+            "-ar",
+            str(sample_rate),
+            "-ac",
+            "1",
+            "-i",
+            "pipe:0",
+        ]
+        for output_path, quality in outputs:
+            cmd += [
+                "-map",
+                "0:a",
+                "-codec:a",
+                "libmp3lame",
+                "-q:a",
+                str(quality),
+                output_path,
+            ]
+
+        try:
+            self._encode_from_stdin(cmd, samples)
+            return [p for p, _ in outputs]
+        except Exception as e:
+            raise ValueError(f"Gagal save MP3: {str(e)}")
+
+    def _encode_from_stdin(self, cmd: List[str], samples: np.ndarray) -> None:
+        # stdout/stderr ke DEVNULL: MP3 ditulis ke path output, dan log
+        # tidak perlu ditimbun Python selama encode berjalan
+        proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            bufsize=0,
+        )
+
+        # Feed stdin dari thread terpisah per 1 MiB slice memoryview (tanpa
+        # salinan tobytes); pipe unbuffered berarti tiap slice = satu write
+        # syscall, dan encoder membaca paralel dengan feed sehingga tidak
+        # pernah memblokir satu write raksasa
+        def _feed():
+            mv = memoryview(np.ascontiguousarray(samples)).cast("B")
+            try:
+                for off in range(0, len(mv), 1 << 20):
+                    proc.stdin.write(mv[off : off + (1 << 20)])
+            except BrokenPipeError:
+                pass  # encoder mati duluan; error dilaporkan via wait()
+            finally:
+                proc.stdin.close()
+
+        writer = threading.Thread(target=_feed, daemon=True)
+        writer.start()
+        proc.wait()
+        writer.join()
+        if proc.returncode != 0:
+            raise ValueError(f"ffmpeg exit code {proc.returncode}")
+
+
+# Mixer pygame global untuk proses; hitung pemakai supaya cleanup() satu
+# player tidak mematikan audio player lain yang masih hidup
+_mixer_refcount = 0
+_mixer_lock = threading.Lock()
+
+
+def _acquire_mixer():
+    global _mixer_refcount
+    with _mixer_lock:
+        if _mixer_refcount == 0:
+            pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=1024)
+        _mixer_refcount += 1
+
+
+def _release_mixer():
+    global _mixer_refcount
+    with _mixer_lock:
+        if _mixer_refcount > 0:
+            _mixer_refcount -= 1
+            if _mixer_refcount == 0:
+                pygame.mixer.quit()
+
 
 class AudioPlayer:
-    def __init__(self, on_position_change: Optional[Callable[[float], None]] = None):
-        pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=1024)
+    def __init__(
+        self,
+        on_position_change: Optional[Callable[[float], None]] = None,
+        tk_root=None,
+    ):
+        # Mixer di-acquire lazy saat load pertama: SDL menyalakan thread
+        # audio begitu init, sia-sia kalau user tidak pernah memutar apa pun
+        self._mixer_acquired = False
 
         self.current_file = None
         self.duration = 0.0
@@ -93,18 +568,29 @@ class AudioPlayer:
         self.position = 0.0
         self.volume = 0.7
 
+        # Playback dari posisi != 0: mixer.music tidak bisa seek MP3, jadi
+        # seek dimainkan sebagai Sound dari slice PCM hasil decode (cache)
+        self._samples = None
+        self._sample_rate = 44100
+        self._sound = None
+        self._channel = None
+
         # Callback untuk update posisi
         self.on_position_change = on_position_change
 
-        # Thread untuk update posisi
-        self.position_thread = None
-        self.stop_position_thread = False
+        # Update posisi lewat after() di event loop Tk; tanpa GUI, panggil
+        # tick() manual dari loop pemanggil
+        self.tk_root = tk_root
+        self._tick_base_time = 0.0
+        self._tick_base_position = 0.0
 
     def load(self, file_path: str) -> bool:
         try:
             if not os.path.exists(file_path):
                 raise FileNotFoundError(f"File tidak ditemukan: {file_path}")
 
+            self._ensure_mixer()
+
             # Stop playback yang sedang berjalan
             self.stop()
 
@@ -113,14 +599,16 @@ class AudioPlayer:
 
             self.current_file = file_path
 
-            # Dapatkan durasi file menggunakan AudioHandler
-            audio_handler = AudioHandler()
-            info = audio_handler.get_audio_info(file_path)
+            # Dapatkan durasi file menggunakan AudioHandler bersama
+            info = AudioHandler.instance().get_audio_info(file_path)
             self.duration = info["duration_seconds"]
 
             self.position = 0.0
             self.is_playing = False
             self.is_paused = False
+            self._samples = None  # PCM di-decode lazy saat seek pertama
+            self._sound = None
+            self._channel = None
 
             return True
 
@@ -135,16 +623,24 @@ class AudioPlayer:
 
             if self.is_paused:
                 # Resume dari pause
-                pygame.mixer.music.unpause()
+                if self._channel is not None:
+                    self._channel.unpause()
+                else:
+                    pygame.mixer.music.unpause()
                 self.is_paused = False
+            elif self.position > 0:
+                # Start dari tengah: lewat slice PCM
+                self._play_from(self.position)
             else:
-                # Start dari awal atau posisi tertentu
-                pygame.mixer.music.play(start=self.position)
+                # Start dari awal: streaming mixer.music biasa
+                self._channel = None
+                self._sound = None
+                pygame.mixer.music.play()
 
             self.is_playing = True
 
-            # Start thread untuk update posisi
-            self._start_position_thread()
+            # Start pelacakan posisi
+            self._start_position_tracking()
 
             return True
 
@@ -155,9 +651,11 @@ class AudioPlayer:
     def pause(self) -> bool:
         try:
             if self.is_playing and not self.is_paused:
-                pygame.mixer.music.pause()
+                if self._channel is not None:
+                    self._channel.pause()
+                else:
+                    pygame.mixer.music.pause()
                 self.is_paused = True
-                self._stop_position_thread()
                 return True
             return False
 
@@ -165,13 +663,23 @@ class AudioPlayer:
             print(f"Error pausing audio: {e}")
             return False
 
+    def _ensure_mixer(self):
+        if not self._mixer_acquired:
+            _acquire_mixer()
+            self._mixer_acquired = True
+
     def stop(self) -> bool:
         try:
+            if not self._mixer_acquired:
+                return True  # belum pernah load; tidak ada yang dihentikan
             pygame.mixer.music.stop()
+            if self._channel is not None:
+                self._channel.stop()
+                self._channel = None
+                self._sound = None
             self.is_playing = False
             self.is_paused = False
             self.position = 0.0
-            self._stop_position_thread()
             return True
 
         except Exception as e:
@@ -182,6 +690,8 @@ class AudioPlayer:
         try:
             volume = max(0.0, min(1.0, volume))  # Clamp ke range 0-1
             pygame.mixer.music.set_volume(volume)
+            if self._channel is not None:
+                self._channel.set_volume(volume)
             self.volume = volume
             return True
 
@@ -192,32 +702,46 @@ class AudioPlayer:
     def get_volume(self) -> float:
         return self.volume
 
+    def _play_from(self, position: float) -> None:
+        # PCM sudah ada di cache decode; seek = mainkan slice-nya sebagai
+        # Sound (zero-copy view sampai duplikasi stereo)
+        if self._samples is None:
+            self._samples, self._sample_rate = AudioHandler.instance().load_mp3(
+                self.current_file
+            )
+        start = int(position * self._sample_rate)
+        seg = self._samples[start:]
+        # Mixer di-init stereo: duplikasi mono ke dua kanal untuk make_sound
+        stereo = np.ascontiguousarray(np.repeat(seg[:, np.newaxis], 2, axis=1))
+        self._sound = pygame.sndarray.make_sound(stereo)
+        self._channel = self._sound.play()
+        if self._channel is not None:
+            self._channel.set_volume(self.volume)
+
     def set_position(self, position: float) -> bool:
         try:
             if self.current_file is None or position < 0 or position > self.duration:
                 return False
 
-            # PERINGATAN: pygame.mixer.music tidak mendukung seeking untuk MP3
-            # Kita hanya bisa restart dari awal
             was_playing = self.is_playing and not self.is_paused
 
-            if abs(position - 0.0) < 0.1:  # Jika posisi mendekati 0, restart
-                # Stop current playback
-                pygame.mixer.music.stop()
-                self.position = 0.0
+            # Hentikan backend yang aktif lalu lanjutkan dari posisi baru
+            pygame.mixer.music.stop()
+            if self._channel is not None:
+                self._channel.stop()
+                self._channel = None
+                self._sound = None
+
+            self.position = float(position)
+            self.is_paused = False
 
-                # Restart jika sedang playing
-                if was_playing:
+            if was_playing:
+                if self.position > 0:
+                    self._play_from(self.position)
+                else:
                     pygame.mixer.music.play()
-                    self._start_position_thread()
-                return True
-            else:
-                # Untuk posisi selain 0, kita tidak bisa melakukan seeking
-                # Hanya update posisi UI tanpa mengubah playback
-                print(
-                    f"Warning: Cannot seek to position {position:.1f}s. MP3 seeking not supported by pygame.mixer.music"
-                )
-                return False
+                self._start_position_tracking()
+            return True
 
         except Exception as e:
             print(f"Error setting position: {e}")
@@ -229,51 +753,48 @@ class AudioPlayer:
     def get_duration(self) -> float:
         return self.duration
 
+    def _backend_busy(self) -> bool:
+        if self._channel is not None:
+            return self._channel.get_busy()
+        return pygame.mixer.music.get_busy()
+
     def is_busy(self) -> bool:
-        return pygame.mixer.music.get_busy() or self.is_playing
-
-    def _start_position_thread(self):
-        self._stop_position_thread()
-        self.stop_position_thread = False
-        self.position_thread = threading.Thread(target=self._position_updater)
-        self.position_thread.daemon = True
-        self.position_thread.start()
-
-    def _stop_position_thread(self):
-        self.stop_position_thread = True
-        if self.position_thread and self.position_thread.is_alive():
-            self.position_thread.join(timeout=0.1)
-
-    def _position_updater(self):
-        start_time = time.time()
-        start_position = self.position
-
-        while not self.stop_position_thread and self.is_playing:
-            if not self.is_paused and pygame.mixer.music.get_busy():
-                elapsed = time.time() - start_time
-                self.position = start_position + elapsed
-
-                # Pastikan tidak melebihi durasi
-                if self.position >= self.duration:
-                    self.position = self.duration
-                    self.is_playing = False
-                    break
-
-                # Callback untuk update UI
-                if self.on_position_change:
-                    self.on_position_change(self.position)
-
-            elif not pygame.mixer.music.get_busy() and self.is_playing:
-                # Playback selesai
-                self.is_playing = False
+        return self._backend_busy() or self.is_playing
+
+    def _start_position_tracking(self):
+        # Tick menumpang event loop Tk: tanpa thread ekstra, tanpa wake-up
+        # GIL 10x/detik di background
+        self._tick_base_time = time.time()
+        self._tick_base_position = self.position
+        if self.tk_root is not None:
+            self.tk_root.after(100, self.tick)
+
+    def tick(self):
+        # Dipanggil dari event loop (terjadwal sendiri via after saat ada
+        # tk_root; pemakai non-GUI memanggilnya dari loop-nya sendiri)
+        if not self.is_playing or self.is_paused:
+            return
+
+        if self._backend_busy():
+            self.position = self._tick_base_position + (
+                time.time() - self._tick_base_time
+            )
+            if self.position >= self.duration:
                 self.position = self.duration
-                if self.on_position_change:
-                    self.on_position_change(self.position)
-                break
-
-            time.sleep(0.1)  # Update setiap 100ms
+                self.is_playing = False
+            if self.on_position_change:
+                self.on_position_change(self.position)
+            if self.is_playing and self.tk_root is not None:
+                self.tk_root.after(100, self.tick)
+        else:
+            # Playback selesai
+            self.is_playing = False
+            self.position = self.duration
+            if self.on_position_change:
+                self.on_position_change(self.position)
 
     def cleanup(self):
         self.stop()
-        self._stop_position_thread()
-        pygame.mixer.quit()
+        if self._mixer_acquired:
+            self._mixer_acquired = False
+            _release_mixer()
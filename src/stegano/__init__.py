@@ -3,6 +3,7 @@ from .utils import (
     bytes_to_bits,
     vigenere256_encrypt,
     key_to_seed,
+    calculate_psnr,
     collect_frames_and_regions,
     evaluate_audio_quality,
 )
@@ -15,6 +16,7 @@ __all__ = [
     "bytes_to_bits",
     "vigenere256_encrypt",
     "key_to_seed",
+    "calculate_psnr",
     "collect_frames_and_regions",
     "evaluate_audio_quality",
 ]
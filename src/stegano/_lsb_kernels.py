@@ -0,0 +1,97 @@
+# Kernel numba opsional untuk jalur panas LSB. Modul ini aman diimpor tanpa
+# numba: semua simbol bernilai None dan pemanggil jatuh ke jalur NumPy.
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+if numba is not None:
+
+    @numba.njit(cache=True)
+    def embed_kernel(buf, starts, ends, start_offset, nlsb, bits):  # pragma: no cover
+        # Konsumsi bit berurutan, jadi kernel serial — prange tidak bisa
+        # dipakai tanpa mengubah urutan penulisan
+        mask = 0xFF ^ ((1 << nlsb) - 1)
+        nbits = bits.size
+        n_full = nbits // nlsb
+        rem = nbits - n_full * nlsb
+        # Lewati start_offset secara aritmetik per region, bukan lewat cek
+        # passed < start_offset di setiap byte — branch itu hanya berubah
+        # sekali dan mengotori loop panas
+        r0 = 0
+        skip = start_offset
+        while r0 < starts.size and skip >= ends[r0] - starts[r0]:
+            skip -= ends[r0] - starts[r0]
+            r0 += 1
+        bits_idx = 0
+        done = 0
+        for r in range(r0, starts.size):
+            lo = starts[r] + skip if r == r0 else starts[r]
+            # Jumlah grup penuh untuk region ini dihitung di muka; loop
+            # dalam berjalan tanpa cek habis-bit maupun grup parsial
+            take = min(n_full - done, ends[r] - lo)
+            for pos in range(lo, lo + take):
+                v = 0
+                for k in range(bits_idx, bits_idx + nlsb):
+                    v = (v << 1) | (bits[k] & 1)
+                buf[pos] = (buf[pos] & mask) | v
+                bits_idx += nlsb
+            done += take
+            if done == n_full:
+                if rem:
+                    pos = lo + take
+                    if pos >= ends[r]:
+                        # Grup parsial jatuh di awal region berikutnya
+                        continue
+                    v = 0
+                    for k in range(bits_idx, nbits):
+                        v = (v << 1) | (bits[k] & 1)
+                    buf[pos] = (buf[pos] & mask) | v
+                    bits_idx = nbits
+                return bits_idx
+        return bits_idx
+
+    @numba.njit(cache=True)
+    def slice_stream_kernel(mp3_arr, reg_starts, reg_cum, a, b, out):  # pragma: no cover
+        # Salin [a, b) dari aliran main-data virtual; loop per region jalan
+        # sebagai kode mesin, penting saat payload besar dibaca per chunk
+        pos = a
+        o = 0
+        r = np.searchsorted(reg_cum, a, side="right")
+        while pos < b:
+            base = reg_cum[r - 1] if r > 0 else 0
+            take = min(reg_cum[r] - pos, b - pos)
+            s = reg_starts[r] + (pos - base)
+            out[o : o + take] = mp3_arr[s : s + take]
+            pos += take
+            o += take
+            r += 1
+
+    @numba.njit(parallel=True, cache=True)
+    def diff_sse_kernel(old_vals, new_vals):  # pragma: no cover
+        # Reduksi jumlah kuadrat selisih byte yang berubah; prange membagi
+        # reduksi antar core, tanpa temporari diff/square
+        s = 0
+        for i in numba.prange(old_vals.size):
+            d = np.int64(old_vals[i]) - np.int64(new_vals[i])
+            s += d * d
+        return s
+
+    @numba.njit(parallel=True, cache=True)
+    def unpack_bits_kernel(vals, nlsb, out):  # pragma: no cover
+        # Ekspansi grup nlsb-bit ke bit individual (MSB-first) dalam satu
+        # pass paralel, tanpa temporari broadcast vals[:,None] >> shifts
+        for i in numba.prange(vals.size):
+            v = vals[i]
+            base = i * nlsb
+            for k in range(nlsb):
+                out[base + k] = (v >> (nlsb - 1 - k)) & 1
+
+else:
+    diff_sse_kernel = None
+    embed_kernel = None
+    slice_stream_kernel = None
+    unpack_bits_kernel = None
@@ -1,42 +1,43 @@
 import json
+import logging
 import math
 import mimetypes
+import mmap
 import os
 import random
+import shutil
 import stat
 from hashlib import sha256
 from typing import Tuple, Optional
 from zlib import crc32
 
+import numpy as np
+
 from stegano.utils import (
-    bytes_to_bits,
     collect_frames_and_regions,
     key_to_seed,
     vigenere256_encrypt,
 )
 
 
+from stegano._lsb_kernels import (
+    diff_sse_kernel as _diff_sse_kernel,
+    embed_kernel as _embed_kernel,
+    slice_stream_kernel as _slice_stream_kernel,
+    unpack_bits_kernel as _unpack_bits_kernel,
+)
+
+
+# Trace lewat logging, bukan print: tanpa format + flush stdout di jalur
+# panas kecuali level-nya diaktifkan (logging.basicConfig(level=...))
+logger = logging.getLogger(__name__)
+
 _MAGIC = b"MLSBv3"
 _FLAG_ENCRYPTED = 1 << 0
 _FLAG_RANDOM_START = 1 << 1
 _HEADER_LEN_FIXED = 22
 
 
-def _compute_psnr(a: bytes, b: bytes) -> float:
-    assert len(a) == len(b)
-    if len(a) == 0:
-        return float("inf")
-    mse = 0.0
-    for x, y in zip(a, b):
-        d = x - y
-        mse += d * d
-    mse /= len(a)
-    if mse == 0:
-        return float("inf")
-    MAX = 255.0
-    return 10.0 * math.log10((MAX * MAX) / mse)
-
-
 def _file_metadata(path: str, payload: bytes) -> dict:
     st = os.stat(path)
     base = os.path.basename(path)
@@ -69,21 +70,36 @@ def _apply_metadata(path: str, meta: dict):
         pass
 
 
-def _resolve_output_path(out_path: Optional[str], meta: dict) -> str:
+def _open_output(out_path: Optional[str], meta: dict):
+    """Buka file output extract; return (file object, path)."""
     fn = (
         meta.get("filename", "recovered.bin")
         if isinstance(meta, dict)
         else "recovered.bin"
     )
+    # wb+ tanpa buffering: payload ditulis lewat mmap output, jadi file
+    # object hanya dipakai untuk membuat + truncate + memetakan fd
     if not out_path or out_path.strip() == "":
-        return fn
+        return open(fn, "wb+", buffering=0), fn
     if os.path.isdir(out_path) or out_path.endswith(os.sep):
         os.makedirs(out_path, exist_ok=True)
-        return os.path.join(out_path, fn)
+        # Buat file secara atomik dengan O_EXCL; FileExistsError langsung
+        # memilih suffix berikutnya — bebas race, satu syscall per kandidat
+        name, ext = os.path.splitext(fn)
+        counter = 0
+        candidate = fn
+        while True:
+            full = os.path.join(out_path, candidate)
+            try:
+                fd = os.open(full, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o644)
+                return os.fdopen(fd, "wb+", buffering=0), full
+            except FileExistsError:
+                counter += 1
+                candidate = f"{name}_{counter}{ext}"
     parent = os.path.dirname(out_path)
     if parent and not os.path.exists(parent):
         os.makedirs(parent, exist_ok=True)
-    return out_path
+    return open(out_path, "wb+", buffering=0), out_path
 
 
 class MultipleLSBSteganography:
@@ -99,8 +115,22 @@ class MultipleLSBSteganography:
     ) -> str:
         if nlsb < 1 or nlsb > 4:
             raise ValueError("n_lsb harus antara 1-4")
-        mp3 = open(mp3_path, "rb").read()
-        payload_plain = open(payload_path, "rb").read()
+        # Cover dipetakan read-only hanya untuk scan dan validasi; salinan
+        # output dibuat lewat copyfile (copy_file_range di Linux) dan byte
+        # yang berubah di-scatter langsung ke mapping file output
+        with open(mp3_path, "rb") as f_mp3:
+            if os.fstat(f_mp3.fileno()).st_size == 0:
+                raise RuntimeError("No usable MP3 frames found.")
+            mp3_mm = mmap.mmap(f_mp3.fileno(), 0, access=mmap.ACCESS_READ)
+        mp3 = memoryview(mp3_mm)
+        # mmap payload-nya: page cache OS yang melayani, tanpa salinan bytes
+        # penuh di RAM. Downstream (sha256/crc32/vigenere) menerima buffer
+        with open(payload_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size > 0:
+                payload_mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                payload_mm = None  # mmap tidak bisa memetakan file kosong
+        payload_plain = memoryview(payload_mm) if payload_mm is not None else memoryview(b"")
 
         meta_json = json.dumps(
             _file_metadata(payload_path, payload_plain), separators=(",", ":")
@@ -126,13 +156,23 @@ class MultipleLSBSteganography:
             + meta_json
         )
 
-        message = header + data
-        msg_bits = bytes_to_bits(message)
+        # Ekspansi bit tervektorisasi: unpackbits jalan di kecepatan memcpy,
+        # dan np.frombuffer zero-copy di atas mmap payload
+        msg_bits = np.concatenate(
+            (
+                np.unpackbits(np.frombuffer(header, dtype=np.uint8)),
+                np.unpackbits(np.frombuffer(data, dtype=np.uint8)),
+            )
+        )
+        total_len = len(header) + len(data)
+        if payload_mm is not None:
+            payload_plain.release()
+            payload_mm.close()
 
-        regs = collect_frames_and_regions(mp3)
-        if not regs:
+        reg_starts, reg_ends = collect_frames_and_regions(mp3)
+        if reg_starts.size == 0:
             raise RuntimeError("No usable MP3 frames found.")
-        total_bytes_md = sum(e - s for s, e in regs)
+        total_bytes_md = int((reg_ends - reg_starts).sum())
         start_offset = 0
         if random_start:
             start_offset = random.Random(key_to_seed(key)).randrange(0, total_bytes_md)
@@ -142,34 +182,90 @@ class MultipleLSBSteganography:
                 f"Insufficient capacity: need {len(msg_bits)} bits, have {cap_bits} bits."
             )
 
-        mp3_out = bytearray(mp3)
+        n_total = len(mp3)
+        mp3.release()
+        mp3_mm.close()
+        # Salinan cover -> output di level kernel, lalu mapping shared:
+        # hanya halaman yang benar-benar ditulis yang jadi kotor, dan tidak
+        # ada tulis-balik O(file) dari userspace di akhir
+        shutil.copyfile(mp3_path, out_path)
+        f_out = open(out_path, "r+b")
+        out_mm = mmap.mmap(f_out.fileno(), 0)
+        buf = np.frombuffer(out_mm, dtype=np.uint8)
         bits_idx = 0
-        passed = 0
         mask = 0xFF ^ ((1 << nlsb) - 1)
-        for s, e in regs:
-            for pos in range(s, e):
-                if passed < start_offset:
-                    passed += 1
-                    continue
-                if bits_idx >= len(msg_bits):
-                    break
-                group = msg_bits[bits_idx : bits_idx + nlsb]
-                v = 0
-                for bit in group:
-                    v = (v << 1) | (bit & 1)
-                mp3_out[pos] = (mp3_out[pos] & mask) | v
-                bits_idx += len(group)
-            if bits_idx >= len(msg_bits):
-                break
+        nbits = int(msg_bits.size)
+
+        # Posisi byte yang benar-benar dimodifikasi; dipakai juga untuk
+        # menghitung PSNR dari selisihnya saja (byte lain identik)
+        positions = np.concatenate(
+            [np.arange(s, e, dtype=np.int64) for s, e in zip(reg_starts, reg_ends)]
+        )[start_offset:]
+        n_used = -(-nbits // nlsb)
+        pos_used = positions[:n_used]
+        old_vals = buf[pos_used]  # fancy indexing = salinan
+
+        if _embed_kernel is not None:
+            bits_idx = int(
+                _embed_kernel(buf, reg_starts, reg_ends, start_offset, nlsb, msg_bits)
+            )
+        else:
+            # Fallback NumPy tervektorisasi: pack bit per grup nlsb lalu
+            # scatter sekali ke posisi target — tanpa loop Python per byte
+            n_full = nbits // nlsb
+            if nlsb == 1:
+                # Kasus default 1-LSB: bit = nilai grup, tanpa reshape/pack
+                pos = positions[:nbits]
+                buf[pos] = (buf[pos] & mask) | msg_bits
+                bits_idx = nbits
+            elif n_full:
+                # packbits per baris lalu geser: satu panggilan C, tanpa
+                # temporari broadcast + reduksi sum
+                grouped = msg_bits[: n_full * nlsb].reshape(-1, nlsb)
+                packed = np.packbits(grouped, axis=1)[:, 0] >> (8 - nlsb)
+                pos = positions[:n_full]
+                buf[pos] = (buf[pos] & mask) | packed
+                bits_idx = n_full * nlsb
+            if bits_idx < nbits and n_full < positions.size:
+                # Grup parsial terakhir: packbits meratakan bit ke kiri,
+                # geser balik agar nilai r-bit jatuh di bit rendah — sama
+                # dengan semantik loop lama (dan kernel numba)
+                r = nbits - bits_idx
+                v = int(np.packbits(msg_bits[bits_idx:])[0]) >> (8 - r)
+                p = int(positions[n_full])
+                buf[p] = (buf[p] & mask) | v
+                bits_idx = nbits
         if bits_idx < len(msg_bits):
             raise RuntimeError("Unexpected: capacity ran out after pre-check.")
 
-        psnr = _compute_psnr(mp3, bytes(mp3_out))
-        open(out_path, "wb").write(mp3_out)
-        print(f"PSNR (cover vs stego): {psnr:.2f} dB")
-        print(
-            f"Embedded {len(message)} bytes (header+meta+payload) using {nlsb}-LSB "
-            f"(encrypt={'on' if encrypt else 'off'}, random_start={'on' if random_start else 'off'}) into '{out_path}'."
+        # PSNR dari byte yang berubah saja; MSE tetap dibagi seluruh file
+        new_vals = buf[pos_used]
+        if _diff_sse_kernel is not None:
+            sse = int(_diff_sse_kernel(old_vals, new_vals))
+        else:
+            sse = int(
+                np.square(
+                    np.subtract(old_vals, new_vals, dtype=np.int32), dtype=np.int64
+                ).sum()
+            )
+        if sse == 0:
+            psnr = float("inf")
+        else:
+            psnr = 10.0 * math.log10(255.0 * 255.0 * n_total / sse)
+
+        del buf  # lepaskan ekspor buffer sebelum menutup mapping
+        out_mm.flush()
+        out_mm.close()
+        f_out.close()
+        logger.info("PSNR (cover vs stego): %.2f dB", psnr)
+        logger.info(
+            "Embedded %d bytes (header+meta+payload) using %d-LSB "
+            "(encrypt=%s, random_start=%s) into '%s'.",
+            total_len,
+            nlsb,
+            "on" if encrypt else "off",
+            "on" if random_start else "off",
+            out_path,
         )
         return out_path
 
@@ -180,14 +276,19 @@ class MultipleLSBSteganography:
         key: str,
         restore_meta: bool = True,
     ) -> Tuple[str, int, str]:
-        mp3 = open(mp3_path, "rb").read()
-        regs = collect_frames_and_regions(mp3)
-        if not regs:
+        # memmap read-only: scan dan pembacaan payload dilayani page cache
+        # OS tanpa salinan file penuh di heap — puncak RSS tidak lagi O(file)
+        if os.path.getsize(mp3_path) == 0:
+            raise RuntimeError("No MP3 frames/regions found.")
+        mp3_arr = np.memmap(mp3_path, dtype=np.uint8, mode="r")
+        reg_starts, reg_ends = collect_frames_and_regions(memoryview(mp3_arr))
+        if reg_starts.size == 0:
             raise RuntimeError("No MP3 frames/regions found.")
-        stream = bytearray()
-        for s, e in regs:
-            stream.extend(mp3[s:e])
-        total_bytes = len(stream)
+        # Aliran main-data dibiarkan virtual: cukup offset region + panjang
+        # kumulatifnya. Byte baru disalin per rentang yang benar-benar
+        # dibaca, jadi payload kecil di file panjang tidak membayar O(N)
+        reg_cum = np.cumsum(reg_ends - reg_starts)
+        total_bytes = int(reg_cum[-1])
         if total_bytes == 0:
             raise RuntimeError("Main-data stream empty.")
 
@@ -195,8 +296,8 @@ class MultipleLSBSteganography:
 
         for n in (1, 2, 3, 4):
             for off in cand_offsets:
-                br = _BitStreamReader(stream, off, n)
-                fixed = br.read(_HEADER_LEN_FIXED)
+                br = _BitStreamReader(mp3_arr, reg_starts, reg_cum, off, n)
+                fixed = bytes(br.read(_HEADER_LEN_FIXED))
                 if (
                     len(fixed) != _HEADER_LEN_FIXED
                     or fixed[:6] != _MAGIC
@@ -211,36 +312,67 @@ class MultipleLSBSteganography:
                 if len(meta_bytes) != meta_len:
                     continue
                 try:
-                    meta = json.loads(meta_bytes.decode("utf-8"))
+                    meta = json.loads(bytes(meta_bytes).decode("utf-8"))
                 except Exception:
                     continue
 
-                out_file = _resolve_output_path(out_path, meta)
                 kb = key.encode("utf-8") if (flags & _FLAG_ENCRYPTED) else None
                 km = len(kb) if kb else 0
 
                 crc_calc = 0
                 written = 0
+                out_file = None
                 try:
-                    with open(out_file, "wb") as f:
+                    f, out_file = _open_output(out_path, meta)
+                    with f:
                         CHUNK = 1 << 16
-                        while written < payload_len:
-                            need = min(CHUNK, payload_len - written)
-                            raw = br.read(need)
-                            if len(raw) != need:
-                                raise IOError("Truncated payload in stream")
-                            crc_calc = crc32(raw, crc_calc)
-                            if kb:
-                                dec = bytearray(need)
-                                for i, b in enumerate(raw):
-                                    dec[i] = (b - kb[(written + i) % km]) & 0xFF
-                                f.write(dec)
-                            else:
-                                f.write(raw)
-                            written += need
+                        # Kunci di-tile sekali sepanjang CHUNK + km; tiap chunk
+                        # cukup slicing view mulai fase written % km, tanpa
+                        # np.tile maupun alokasi hasil baru per iterasi
+                        key_tiled = None
+                        if kb:
+                            key_arr = np.frombuffer(kb, dtype=np.uint8)
+                            key_tiled = np.tile(key_arr, -(-(CHUNK + km) // km))
+                        # Output dipetakan sekali seukuran payload; dekripsi
+                        # menulis langsung ke halaman mapping (writeback
+                        # async oleh kernel), tanpa syscall write per chunk
+                        out_mm = None
+                        out_arr = None
+                        dst = None
+                        if payload_len:
+                            f.truncate(payload_len)
+                            out_mm = mmap.mmap(f.fileno(), payload_len)
+                            out_arr = np.frombuffer(out_mm, dtype=np.uint8)
+                        try:
+                            while written < payload_len:
+                                need = min(CHUNK, payload_len - written)
+                                raw = br.read(need)
+                                if len(raw) != need:
+                                    raise IOError("Truncated payload in stream")
+                                crc_calc = crc32(raw, crc_calc)
+                                dst = out_arr[written : written + need]
+                                if kb:
+                                    # Pengurangan uint8 wrap otomatis modulo
+                                    # 256, hasil langsung ke mapping
+                                    phase = written % km
+                                    np.subtract(
+                                        raw,
+                                        key_tiled[phase : phase + need],
+                                        out=dst,
+                                    )
+                                else:
+                                    dst[:] = raw
+                                written += need
+                        finally:
+                            if out_mm is not None:
+                                # lepaskan ekspor buffer sebelum close
+                                out_arr = None
+                                dst = None
+                                out_mm.flush()
+                                out_mm.close()
                 except Exception:
                     try:
-                        if os.path.exists(out_file):
+                        if out_file and os.path.exists(out_file):
                             os.remove(out_file)
                     except Exception:
                         pass
@@ -261,7 +393,7 @@ class MultipleLSBSteganography:
                     f"(nlsb={n}, random_start={'on' if (flags & _FLAG_RANDOM_START) else 'off'}, "
                     f"encrypted={'yes' if (flags & _FLAG_ENCRYPTED) else 'no'})."
                 )
-                print(status)
+                logger.info("%s", status)
                 return out_file, written, status
 
         raise RuntimeError(
@@ -269,27 +401,75 @@ class MultipleLSBSteganography:
         )
 
 
+def _slice_stream(mp3_arr, reg_starts, reg_cum, a: int, b: int) -> np.ndarray:
+    # Salin potongan [a, b) dari aliran main-data virtual; hanya region yang
+    # tersentuh rentang itu yang dibaca dari buffer MP3
+    out = np.empty(b - a, dtype=np.uint8)
+    if _slice_stream_kernel is not None:
+        _slice_stream_kernel(mp3_arr, reg_starts, reg_cum, a, b, out)
+        return out
+    pos = a
+    o = 0
+    r = int(np.searchsorted(reg_cum, a, side="right"))
+    while pos < b:
+        base = int(reg_cum[r - 1]) if r > 0 else 0
+        take = min(int(reg_cum[r]) - pos, b - pos)
+        s = int(reg_starts[r]) + (pos - base)
+        out[o : o + take] = mp3_arr[s : s + take]
+        pos += take
+        o += take
+        r += 1
+    return out
+
+
 class _BitStreamReader:
-    def __init__(self, stream: bytes, start_off: int, nlsb: int):
-        self.stream = stream
-        self.pos = start_off
+    def __init__(self, mp3_arr, reg_starts, reg_cum, start_off: int, nlsb: int):
+        self.mp3_arr = mp3_arr
+        self.reg_starts = reg_starts
+        self.reg_cum = reg_cum
+        self.start = start_off
         self.n = nlsb
         self.mask = (1 << nlsb) - 1
-        self.bitbuf = 0
-        self.bits_in_buf = 0
-        self.total = len(stream)
+        self.total = int(reg_cum[-1]) if len(reg_cum) else 0
+        # Posisi bit yang sudah dikonsumsi sejak start_off; tiap byte stream
+        # menyumbang n bit (MSB-first dalam grup)
+        self.bit_pos = 0
+        self._shifts = np.arange(nlsb - 1, -1, -1, dtype=np.uint8)
 
     def read(self, k: int) -> bytes:
-        out = bytearray()
-        while len(out) < k:
-            if self.bits_in_buf < 8:
-                if self.pos >= self.total:
-                    break
-                v = self.stream[self.pos] & self.mask
-                self.bitbuf = (self.bitbuf << self.n) | v
-                self.bits_in_buf += self.n
-                self.pos += 1
-                continue
-            out.append((self.bitbuf >> (self.bits_in_buf - 8)) & 0xFF)
-            self.bits_in_buf -= 8
-        return bytes(out)
+        if k <= 0:
+            return b""
+        # Hanya rentang byte sumber yang menutupi [bit_pos, bit_pos+8k) yang
+        # diambil dan di-unpack — read berikutnya melanjutkan dari bit_pos,
+        # jadi payload besar tetap diproses inkremental per chunk
+        start_bit = self.bit_pos
+        end_bit = start_bit + 8 * k
+        avail_bits = max(0, (self.total - self.start) * self.n)
+        end_bit = min(end_bit, avail_bits)
+        nbytes_out = (end_bit - start_bit) // 8
+        if nbytes_out <= 0:
+            return b""
+        first = start_bit // self.n
+        last = -(-end_bit // self.n)
+        vals = (
+            _slice_stream(
+                self.mp3_arr,
+                self.reg_starts,
+                self.reg_cum,
+                self.start + first,
+                self.start + last,
+            )
+            & self.mask
+        )
+        if self.n == 1:
+            bits = vals  # sudah 0/1 per byte; tanpa broadcast/shift
+        elif _unpack_bits_kernel is not None:
+            bits = np.empty(vals.size * self.n, dtype=np.uint8)
+            _unpack_bits_kernel(vals, self.n, bits)
+        else:
+            bits = ((vals[:, None] >> self._shifts) & 1).reshape(-1)
+        lo = start_bit - first * self.n
+        self.bit_pos = start_bit + nbytes_out * 8
+        # Kembalikan ndarray uint8 apa adanya: crc32 dan f.write menerima
+        # buffer protocol, jadi tidak perlu salinan tobytes per chunk
+        return np.packbits(bits[lo : lo + nbytes_out * 8])
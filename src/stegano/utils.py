@@ -1,46 +1,204 @@
-from typing import List
+import math
+from functools import lru_cache
 from hashlib import sha256
 
+import numpy as np
 
-def bytes_to_bits(b: bytes) -> List[int]:
-    return [(b[i // 8] >> (7 - (i % 8))) & 1 for i in range(len(b) * 8)]
+try:
+    # Numba opsional: kalau tersedia, reduksi PSNR dikompilasi jadi satu
+    # streaming pass paralel tanpa array diff/square perantara.
+    import numba
+
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _psnr_mse(a, b):  # pragma: no cover - butuh numba terinstall
+        s = 0.0
+        for i in numba.prange(a.size):
+            d = float(a[i]) - float(b[i])
+            s += d * d
+        return s / a.size
+
+    @numba.njit(parallel=True, cache=True)
+    def _vig_add(data, key, out):  # pragma: no cover
+        # Penjumlahan Vigenere per byte tanpa temporari kunci ter-tile;
+        # LLVM mengautovektorisasi penjumlahan uint8 (wrap modulo 256)
+        km = key.size
+        for i in numba.prange(data.size):
+            out[i] = data[i] + key[i % km]
+
+    # Tabel header sebagai array datar supaya bisa dibaca dari dalam njit;
+    # indeks versi: 0 = MPEG-1, 1 = MPEG-2, 2 = MPEG-2.5 (0 berarti invalid)
+    _NB_BITRATES = np.array(
+        [
+            [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 0],
+            [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160, 0],
+            [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160, 0],
+        ],
+        dtype=np.int64,
+    )
+    _NB_SAMPLERATES = np.array(
+        [
+            [44100, 48000, 32000, 0],
+            [22050, 24000, 16000, 0],
+            [11025, 12000, 8000, 0],
+        ],
+        dtype=np.int64,
+    )
+
+    @numba.njit(cache=True)
+    def _scan_frames(mp3, off, max_main, starts, ends):  # pragma: no cover
+        # Pemindai frame yang sama dengan jalur Python di bawah, tapi byte
+        # demi byte dalam kode mesin; mengembalikan jumlah region terisi
+        L = mp3.size
+        count = 0
+        while off + 4 <= L:
+            b1 = mp3[off]
+            b2 = mp3[off + 1]
+            if b1 != 0xFF or (b2 & 0xE0) != 0xE0:
+                off += 1
+                continue
+            ver_bits = (b2 >> 3) & 0x03
+            layer_bits = (b2 >> 1) & 0x03
+            if layer_bits != 0x01 or ver_bits == 0x01:
+                off += 1
+                continue
+            if ver_bits == 0x03:
+                v = 0
+            elif ver_bits == 0x02:
+                v = 1
+            else:
+                v = 2
+            b3 = mp3[off + 2]
+            b4 = mp3[off + 3]
+            bitrate_idx = (b3 >> 4) & 0x0F
+            sr_idx = (b3 >> 2) & 0x03
+            if bitrate_idx == 0 or bitrate_idx == 0x0F or sr_idx == 0x03:
+                off += 1
+                continue
+            br_kbps = _NB_BITRATES[v, bitrate_idx]
+            sr = _NB_SAMPLERATES[v, sr_idx]
+            padding = (b3 >> 1) & 0x01
+            coef = 144 if v == 0 else 72
+            frame_len = (coef * (br_kbps * 1000)) // sr + padding
+            if frame_len < 24:
+                off += 1
+                continue
+            if off + frame_len > L:
+                break
+            channel_mode = (b4 >> 6) & 0x03
+            if v == 0:
+                side_len = 17 if channel_mode == 3 else 32
+            else:
+                side_len = 9 if channel_mode == 3 else 17
+            s = off + 4 + side_len
+            e = min(off + frame_len, s + max_main)
+            if s < e:
+                starts[count] = s
+                ends[count] = e
+                count += 1
+            off += frame_len
+        return count
+
+except ImportError:
+    _psnr_mse = None
+    _scan_frames = None
+    _vig_add = None
+
+# Batas bucket kualitas terendah di evaluate_audio_quality; di bawah ini
+# klasifikasi PSNR tidak bisa berubah lagi
+_PSNR_FLOOR_DB = 10.0
+
+
+def calculate_psnr(cover: np.ndarray, stego: np.ndarray, max_value: float = 255.0) -> float:
+    # Terima array integer apa adanya (uint8/int16); konversi float hanya
+    # terjadi di dalam reduksi sehingga tidak ada buffer float64 sebesar audio.
+    if _psnr_mse is not None:
+        mse = float(_psnr_mse(cover, stego))
+    else:
+        # Akumulasi SSE per potongan ~1M sampel: temporari int32/int64
+        # dibatasi ukuran chunk, bukan seukuran audio. Karena SSE hanya bisa
+        # naik, batas-atas PSNR = 10*log10(MAX^2 * N / SSE) monoton turun;
+        # begitu jatuh di bawah bucket terendah, berhenti lebih awal.
+        total = cover.size
+        sse = 0
+        seen = 0
+        chunk = 1 << 20
+        for start in range(0, total, chunk):
+            stop = min(start + chunk, total)
+            diff = np.subtract(cover[start:stop], stego[start:stop], dtype=np.int32)
+            sse += int(np.square(diff, dtype=np.int64).sum())
+            seen = stop
+            if seen < total and sse:
+                bound = 10.0 * math.log10((max_value * max_value) * total / sse)
+                if bound < _PSNR_FLOOR_DB:
+                    break
+        if seen == 0:
+            return math.inf
+        mse = sse / seen
+    if mse == 0:
+        return math.inf
+    return 10.0 * math.log10((max_value * max_value) / mse)
+
+
+def bytes_to_bits(b: bytes) -> np.ndarray:
+    # Array uint8 berisi 0/1 per bit, MSB-first — urutan sama dengan loop
+    # Python lama, tapi jalan di kecepatan memcpy dan 1 byte per bit
+    return np.unpackbits(np.frombuffer(b, dtype=np.uint8))
 
 
 def vigenere256_encrypt(data: bytes, key: str) -> bytes:
     if not key:
         return data
     kb = key.encode("utf-8")
-    out = bytearray(len(data))
-    for i, b in enumerate(data):
-        out[i] = (b + kb[i % len(kb)]) & 0xFF
-    return bytes(out)
+    if len(kb) == 1:
+        # Kunci satu byte = penambahan konstan mod 256; translate adalah
+        # satu loop C dengan tabel 256 entri, jauh lebih cepat dari loop
+        # per byte di bawah
+        table = bytes((b + kb[0]) & 0xFF for b in range(256))
+        return bytes(data).translate(table)
+    # Penjumlahan uint8 tervektorisasi: wrap modulo 256 gratis, kunci
+    # di-resize sepanjang data dalam satu panggilan C
+    arr = np.frombuffer(data, dtype=np.uint8)
+    key_arr = np.frombuffer(kb, dtype=np.uint8)
+    if _vig_add is not None:
+        out = np.empty(arr.size, dtype=np.uint8)
+        _vig_add(arr, key_arr, out)
+        return out.tobytes()
+    tiled = np.resize(key_arr, arr.size)
+    return (arr + tiled).tobytes()
 
 
+@lru_cache(maxsize=128)
 def key_to_seed(key: str) -> int:
+    # Murni terhadap key; kunci yang sama dipakai berulang antara embed,
+    # extract, dan kandidat offset — cukup hash sekali
     h = sha256(key.encode("utf-8")).digest()
     return int.from_bytes(h[:4], "big")
 
 
-_BITRATE_TABLE = {
-    "1": [None, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, None],
-    "2": [None, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160, None],
-    "2.5": [None, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160, None],
-}
+# Tabel datar diindeks versi (0 = MPEG-1, 1 = MPEG-2, 2 = MPEG-2.5);
+# entri 0 berarti indeks invalid — tanpa lookup dict maupun cek None
+_BITRATE_TABLE = (
+    (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 0),
+    (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160, 0),
+    (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160, 0),
+)
 
-_SR_TABLE = {
-    "1": [44100, 48000, 32000, None],
-    "2": [22050, 24000, 16000, None],
-    "2.5": [11025, 12000, 8000, None],
-}
+_SR_TABLE = (
+    (44100, 48000, 32000, 1),
+    (22050, 24000, 16000, 1),
+    (11025, 12000, 8000, 1),
+)
+
+# ver_bits 2-bit -> indeks versi; 1 = reserved, dipetakan ke 0 dan
+# digugurkan lewat mask validitas
+_VERSION_IDX = (2, 0, 1, 0)
 
 
 def _read_synchsafe32(b):
-    return (
-        ((b[0] & 0x7F) << 21)
-        | ((b[1] & 0x7F) << 14)
-        | ((b[2] & 0x7F) << 7)
-        | (b[3] & 0x7F)
-    )
+    # Satu pembacaan 32-bit lalu mask-geser SWAR per lajur 7-bit, bukan
+    # empat indexing + shift terpisah
+    v = int.from_bytes(b[:4], "big")
+    return ((v >> 3) & 0x0FE00000) | ((v >> 2) & 0x001FC000) | ((v >> 1) & 0x00003F80) | (v & 0x7F)
 
 
 def _skip_id3v2(mp3: bytes) -> int:
@@ -54,76 +212,105 @@ def _skip_id3v2(mp3: bytes) -> int:
 def _parse_header_at(mp3: bytes, off: int):
     if off + 4 > len(mp3):
         return None
-    b1, b2, b3, b4 = mp3[off : off + 4]
-    if b1 != 0xFF or (b2 & 0xE0) != 0xE0:
-        return None
+    b1 = mp3[off]
+    b2 = mp3[off + 1]
+    b3 = mp3[off + 2]
+    b4 = mp3[off + 3]
+    # Semua field diekstrak tanpa syarat lalu divalidasi lewat satu mask;
+    # scan sync di data acak mengeksekusi satu branch yang mudah
+    # diprediksi, bukan deretan early-return yang meleset terus
     ver_bits = (b2 >> 3) & 0x03
     layer_bits = (b2 >> 1) & 0x03
-    if layer_bits != 0x01:
-        return None
-    if ver_bits == 0x01:
-        return None
-    version = {0x03: "1", 0x02: "2", 0x00: "2.5"}.get(ver_bits, None)
-    if version is None:
-        return None
     bitrate_idx = (b3 >> 4) & 0x0F
     sr_idx = (b3 >> 2) & 0x03
     padding = (b3 >> 1) & 0x01
-    channel_mode = (b4 >> 6) & 0x03
-
-    if bitrate_idx == 0 or bitrate_idx == 0x0F:
-        return None
-    if sr_idx == 0x03:
-        return None
-    br_kbps = _BITRATE_TABLE[version][bitrate_idx]
-    sr = _SR_TABLE[version][sr_idx]
-    if br_kbps is None or sr is None:
-        return None
-
-    coef = 144 if version == "1" else 72
-    frame_len = int((coef * (br_kbps * 1000)) // sr + padding)
-    if frame_len < 24:
+    v = _VERSION_IDX[ver_bits]
+    br_kbps = _BITRATE_TABLE[v][bitrate_idx]
+    sr = _SR_TABLE[v][sr_idx]
+    coef = 144 if v == 0 else 72
+    frame_len = (coef * (br_kbps * 1000)) // sr + padding
+    valid = (
+        (b1 == 0xFF)
+        & ((b2 & 0xE0) == 0xE0)
+        & (layer_bits == 0x01)
+        & (ver_bits != 0x01)
+        & (br_kbps != 0)
+        & (sr_idx != 0x03)
+        & (frame_len >= 24)
+    )
+    if not valid:
         return None
 
-    if version == "1":
+    channel_mode = (b4 >> 6) & 0x03
+    if v == 0:
         side_len = 17 if channel_mode == 3 else 32
     else:
         side_len = 9 if channel_mode == 3 else 17
 
-    return {
-        "frame_len": frame_len,
-        "side_len": side_len,
-    }
+    # Tuple, bukan dict: tanpa alokasi dict + hash key per frame
+    return frame_len, side_len
 
 
 def collect_frames_and_regions(mp3: bytes, max_main_bytes_per_frame: int = 512):
-    regions = []
-    off = _skip_id3v2(mp3)
-    L = len(mp3)
+    # Region sebagai dua array int64 (structure-of-arrays): total/cumsum/
+    # concatenate di pemanggil jadi operasi NumPy langsung, tanpa unpack
+    # tuple per region di Python
+    # Satu memoryview untuk seluruh scan: slicing zero-copy dan indexing
+    # skalar mengembalikan int tanpa objek bytes kecil per akses
+    mv = mp3 if isinstance(mp3, memoryview) else memoryview(mp3)
+    off = _skip_id3v2(mv)
+    L = len(mv)
+    if _scan_frames is not None and L:
+        # Frame valid minimal 24 byte, jadi L // 24 cukup sebagai kapasitas
+        cap = L // 24 + 1
+        starts = np.empty(cap, dtype=np.int64)
+        ends = np.empty(cap, dtype=np.int64)
+        count = _scan_frames(
+            np.frombuffer(mv, dtype=np.uint8), off, max_main_bytes_per_frame,
+            starts, ends,
+        )
+        return starts[:count], ends[:count]
+    # Fallback Python: lompat antar kandidat sync 0xFF dengan find()
+    # (memchr di level C) alih-alih maju satu byte per iterasi — gap ID3/
+    # sampah antar frame dilewati di kecepatan bandwidth memori
+    finder = mv.obj if hasattr(mv.obj, "find") else bytes(mv)
+    start_list = []
+    end_list = []
     while off + 4 <= L:
-        hdr = _parse_header_at(mp3, off)
-        if not hdr:
+        nxt = finder.find(b"\xff", off)
+        if nxt < 0 or nxt + 4 > L:
+            break
+        off = nxt
+        hdr = _parse_header_at(mv, off)
+        if hdr is None:
             off += 1
             continue
-        fsize = hdr["frame_len"]
+        fsize, side_len = hdr
         if off + fsize > L:
             break
-        s = off + 4 + hdr["side_len"]
+        s = off + 4 + side_len
         e = min(off + fsize, s + max_main_bytes_per_frame)
         if s < e:
-            regions.append((s, e))
+            start_list.append(s)
+            end_list.append(e)
         off += fsize
-    return regions
+    return (
+        np.array(start_list, dtype=np.int64),
+        np.array(end_list, dtype=np.int64),
+    )
+
+
+# Ambang bucket PSNR naik monoton; searchsorted memetakan nilai (atau
+# array nilai, untuk sweep batch) langsung ke indeks label
+_PSNR_THRESHOLDS = np.array([10.0, 20.0, 30.0, 40.0])
+_PSNR_LABELS = (
+    "Very Poor (< 10 dB)",
+    "Poor (10-20 dB)",
+    "Fair (20-30 dB)",
+    "Good (30-40 dB)",
+    "Excellent (>= 40 dB)",
+)
 
 
 def evaluate_audio_quality(psnr: float) -> str:
-    if psnr >= 40:
-        return "Excellent (>= 40 dB)"
-    elif psnr >= 30:
-        return "Good (30-40 dB)"
-    elif psnr >= 20:
-        return "Fair (20-30 dB)"
-    elif psnr >= 10:
-        return "Poor (10-20 dB)"
-    else:
-        return "Very Poor (< 10 dB)"
+    return _PSNR_LABELS[int(np.searchsorted(_PSNR_THRESHOLDS, psnr, side="right"))]
@@ -3,11 +3,15 @@ Test Report Generator for Audio Steganography
 Tests various configurations and file types with integrity checking
 """
 
+import itertools
 import os
 import sys
 import hashlib
 import random
+import shutil
 import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -17,25 +21,39 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 from stegano import MultipleLSBSteganography
 
 
-def calculate_md5(file_path):
-    """Calculate MD5 hash of a file"""
-    md5_hash = hashlib.md5()
+def calculate_hash(file_path):
+    """Calculate BLAKE2b hash of a file for integrity checking"""
     try:
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                md5_hash.update(chunk)
-        return md5_hash.hexdigest()
+        with open(file_path, "rb", buffering=0) as f:
+            if hasattr(hashlib, "file_digest"):
+                # Python >= 3.11: loop baca berjalan di C tanpa chunk Python
+                return hashlib.file_digest(f, "blake2b").hexdigest()
+            # 1 MiB readinto on an unbuffered file: 256x fewer syscalls than
+            # 4 KiB reads and no new bytes object per chunk
+            h = hashlib.blake2b()
+            buf = bytearray(1 << 20)
+            view = memoryview(buf)
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                h.update(view[:n])
+        return h.hexdigest()
     except Exception as e:
         return f"ERROR: {str(e)}"
 
 
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+
 def format_file_size(size_bytes):
     """Format file size in human-readable format"""
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.2f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.2f} TB"
+    # Indeks unit langsung dari bit_length (eksak untuk int, tanpa error
+    # pembulatan log float), satu pembagian alih-alih loop bagi-dan-uji
+    if size_bytes <= 0:
+        return "0.00 B"
+    i = min((int(size_bytes).bit_length() - 1) // 10, 4)
+    return f"{size_bytes / (1 << (10 * i)):.2f} {_SIZE_UNITS[i]}"
 
 
 def get_file_size(file_path):
@@ -47,10 +65,16 @@ def get_file_size(file_path):
 
 
 class TestCase:
-    def __init__(self, name, cover_file, secret_file, use_encryption, use_random, nlsb, scenario=""):
+    def __init__(self, name, cover_file, secret_file, use_encryption, use_random, nlsb, scenario="",
+                 expected_failure=False):
         self.name = name
+        self.expected_failure = expected_failure
         self.cover_file = cover_file
         self.secret_file = secret_file
+        # Field turunan dihitung sekali di sini, bukan per baris laporan
+        # (os.path.splitext C-coded, tanpa membangun objek Path)
+        self.secret_name = os.path.basename(secret_file)
+        self.secret_suffix = os.path.splitext(secret_file)[1]
         self.use_encryption = use_encryption
         self.use_random = use_random
         self.nlsb = nlsb
@@ -63,12 +87,17 @@ class TestCase:
         self.file_size = 0
         self.execution_time = 0
         self.psnr = "N/A"
-        
+        self._dict = None
+
     def to_dict(self):
+        # Di-cache setelah test selesai: laporan teks dan tabel konsol
+        # (atau output tambahan lain) tidak memformat ulang 11 field
+        if self._dict is not None:
+            return self._dict
         return {
             'name': self.name,
             'cover_file': os.path.basename(self.cover_file),
-            'secret_file': os.path.basename(self.secret_file),
+            'secret_file': self.secret_name,
             'file_size': format_file_size(self.file_size),
             'encryption': 'YES' if self.use_encryption else 'NO',
             'random_start': 'YES' if self.use_random else 'NO',
@@ -82,6 +111,211 @@ class TestCase:
         }
 
 
+# Counter per proses untuk nama file stego & kunci unik
+_test_ctr = itertools.count()
+
+
+def run_single_test(stego, test_case: TestCase, output_dir, extracted_dir):
+    """Run a single test case; mutates and returns the TestCase"""
+    print(f"\nRunning: {test_case.name}")
+    print(f"  Secret file: {test_case.secret_name}")
+    print(f"  Config: Encryption={test_case.use_encryption}, Random={test_case.use_random}, n-LSB={test_case.nlsb}")
+
+    start_time = time.time()
+
+    # Generate unique output file names; file stego hanya hidup selama
+    # satu test (embed -> PSNR -> extract -> hapus), jadi taruh di tmpfs
+    # bila ada agar tidak ada roundtrip disk sama sekali. pid + counter
+    # bebas tabrakan antar worker pool, beda dengan timestamp mikrodetik
+    stem = f"{os.getpid()}_{next(_test_ctr)}"
+    scratch_dir = Path("/dev/shm") if os.path.isdir("/dev/shm") else output_dir
+    stego_file = scratch_dir / f"stego_{stem}.mp3"
+
+    # Get original file size (kecuali sudah diisi dari cache induk)
+    if not test_case.file_size:
+        test_case.file_size = get_file_size(test_case.secret_file)
+
+    # Generate key for encryption/random start
+    key = f"testkey_{stem}"
+
+    try:
+        # Calculate original hash (kecuali sudah diisi dari cache induk)
+        if not test_case.original_hash:
+            test_case.original_hash = calculate_hash(test_case.secret_file)
+
+        # Embed
+        print("  Embedding...")
+        stego.embed_file(
+            mp3_path=test_case.cover_file,
+            payload_path=test_case.secret_file,
+            out_path=str(stego_file),
+            key=key,
+            nlsb=test_case.nlsb,
+            encrypt=test_case.use_encryption,
+            random_start=test_case.use_random
+        )
+
+        # Test negatif (Scenario 2): embed seharusnya ditolak kapasitas;
+        # sampai sini berarti test gagal, tanpa perlu PSNR/ekstraksi
+        if test_case.expected_failure:
+            test_case.integrity = "N/A"
+            test_case.result = "FAILED"
+            test_case.error_message = "Embed succeeded on over-capacity payload"
+            print(f"  ✗ Test FAILED - Expected capacity failure did not happen")
+            try:
+                os.remove(stego_file)
+            except:
+                pass
+            test_case.execution_time = time.time() - start_time
+            test_case._dict = None
+            test_case._dict = test_case.to_dict()
+            return test_case
+
+        # Calculate PSNR (memmap: no full bytes copies in userspace)
+        import numpy as np
+        orig_mm = np.memmap(test_case.cover_file, dtype=np.uint8, mode="r")
+        steg_mm = np.memmap(str(stego_file), dtype=np.uint8, mode="r")
+        L = min(orig_mm.size, steg_mm.size)
+        if L == 0:
+            psnr = float("inf")
+        else:
+            # |a-b| untuk uint8 hanya punya 256 nilai: akumulasi histogram
+            # selisih per potongan 1 MiB, lalu SSE = hist · k^2 — kuadrat
+            # dihitung 256 kali, bukan per byte file
+            hist = np.zeros(256, dtype=np.int64)
+            CHUNK = 1 << 20
+            for i in range(0, L, CHUNK):
+                a = orig_mm[i : min(i + CHUNK, L)].astype(np.int16)
+                b = steg_mm[i : min(i + CHUNK, L)].astype(np.int16)
+                diff = np.abs(a - b).astype(np.uint8)
+                hist += np.bincount(diff, minlength=256)
+            sq = np.arange(256, dtype=np.int64) ** 2
+            mse = float(hist @ sq) / L
+            psnr = (
+                float("inf")
+                if mse == 0
+                else 10.0 * np.log10((255.0 * 255.0) / mse)
+            )
+        del orig_mm, steg_mm  # release mappings before stego cleanup
+        test_case.psnr = f"{psnr:.2f} dB"
+
+        # Extract
+        print("  Extracting...")
+        extracted_path, size_bytes, status = stego.extract_file(
+            mp3_path=str(stego_file),
+            out_path=str(extracted_dir),
+            key=key,
+            restore_meta=True
+        )
+
+        # Cek ukuran dulu: satu stat jauh lebih murah daripada hashing, dan
+        # beda panjang sudah pasti beda isi
+        if get_file_size(extracted_path) != test_case.file_size:
+            test_case.extracted_hash = "<size mismatch>"
+            test_case.integrity = "✗ SIZE MISMATCH"
+            test_case.result = "FAILED"
+            test_case.error_message = "Size mismatch"
+            print(f"  ✗ Test FAILED - Size mismatch")
+        else:
+            # Calculate extracted hash
+            test_case.extracted_hash = calculate_hash(extracted_path)
+
+            # Check integrity
+            if test_case.original_hash == test_case.extracted_hash:
+                test_case.integrity = "✓ MATCH"
+                test_case.result = "SUCCESS"
+                print(f"  ✓ Test PASSED - Integrity verified")
+            else:
+                test_case.integrity = "✗ MISMATCH"
+                test_case.result = "FAILED"
+                test_case.error_message = "Hash mismatch"
+                print(f"  ✗ Test FAILED - Hash mismatch")
+
+        # Cleanup stego file; buang dulu halaman cache-nya agar tidak
+        # menggusur cover.mp3 saat stego ditulis ke disk biasa (di tmpfs
+        # unlink sudah membebaskan memorinya)
+        try:
+            if hasattr(os, "posix_fadvise"):
+                fd = os.open(stego_file, os.O_RDONLY)
+                try:
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+                finally:
+                    os.close(fd)
+            os.remove(stego_file)
+        except:
+            pass
+
+    except Exception as e:
+        if (test_case.expected_failure and isinstance(e, RuntimeError)
+                and str(e).startswith("Insufficient capacity")):
+            # Penolakan kapasitas memang hasil yang diharapkan test negatif
+            test_case.result = "SUCCESS"
+            test_case.integrity = "✓ EXPECTED"
+            test_case.error_message = str(e)[:100]
+            print(f"  ✓ Test PASSED - Capacity overflow rejected as expected")
+            try:
+                if stego_file.exists():
+                    os.remove(stego_file)
+            except:
+                pass
+        else:
+            test_case.result = "ERROR"
+            test_case.integrity = "N/A"
+            test_case.error_message = str(e)[:100]  # Limit error message length
+            print(f"  ✗ Test ERROR: {test_case.error_message}")
+
+            # Simpan artefak stego yang gagal untuk debugging (file di tmpfs
+            # hilang saat dibersihkan), lalu hapus aslinya
+            try:
+                if stego_file.exists():
+                    _copy_artifact(stego_file, output_dir / f"failed_stego_{stem}.mp3")
+                    os.remove(stego_file)
+            except:
+                pass
+
+    test_case.execution_time = time.time() - start_time
+    test_case._dict = None
+    test_case._dict = test_case.to_dict()  # materialisasi sekali, final
+    print(f"  Execution time: {test_case.execution_time:.2f}s")
+    return test_case
+
+
+# Template baris tabel hasil detail: format mini-language diparse sekali di
+# level modul, bukan per baris lewat f-string di loop
+_DETAIL_ROW = ("{no:<4} {name:<45} {file:<18} {size:<10} {enc:<4} {rnd:<4} "
+               "{lsb:<4} {psnr:<12} {result:<9} {integ:<11} {time:<7}\n")
+_detail_fmt = _DETAIL_ROW.format
+
+
+def _copy_artifact(src, dst):
+    """Salin file artefak: os.sendfile zero-copy di kernel bila tersedia"""
+    with open(src, "rb") as s, open(dst, "wb") as d:
+        if hasattr(os, "sendfile"):
+            remaining = os.fstat(s.fileno()).st_size
+            offset = 0
+            try:
+                while remaining > 0:
+                    sent = os.sendfile(d.fileno(), s.fileno(), offset, remaining)
+                    if sent == 0:
+                        break
+                    offset += sent
+                    remaining -= sent
+                return
+            except OSError:
+                # sendfile bisa gagal antar filesystem tertentu; ulangi
+                # dari awal lewat jalur buffer biasa
+                s.seek(0)
+                d.seek(0)
+                d.truncate()
+        shutil.copyfileobj(s, d, length=1 << 20)
+
+
+def _run_test_worker(args):
+    """Worker proses: bangun instance stego sendiri lalu jalankan satu test"""
+    test_case, output_dir, extracted_dir = args
+    return run_single_test(MultipleLSBSteganography(), test_case, output_dir, extracted_dir)
+
+
 class TestReport:
     def __init__(self):
         self.stego = MultipleLSBSteganography()
@@ -97,6 +331,37 @@ class TestReport:
         
         # Test files
         self.cover_audio = self.tests_dir / "cover.mp3"
+
+        # Panaskan page cache untuk cover.mp3 sekali di awal: setiap test
+        # (dan worker pool) membaca file yang sama berulang-ulang
+        if hasattr(os, "posix_fadvise") and self.cover_audio.exists():
+            fd = os.open(self.cover_audio, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(fd)
+
+        # Cache hash file rahasia: 16 test case memakai sample_secret.txt
+        # yang sama, cukup sekali hashing per (path, mtime, size)
+        self._hash_cache = {}
+
+        # Pengelompokan per skenario dibangun sekali setelah suite jalan;
+        # laporan teks dan tabel konsol memakai dict yang sama
+        self.scenarios = {}
+
+    def _group_by_scenario(self):
+        scenarios = {}
+        for test in self.test_cases:
+            scenario = test.scenario if test.scenario else "Other"
+            scenarios.setdefault(scenario, []).append(test)
+        return scenarios
+
+    def _cached_hash(self, path):
+        st = os.stat(path)
+        key = (path, st.st_mtime_ns, st.st_size)
+        if key not in self._hash_cache:
+            self._hash_cache[key] = calculate_hash(path)
+        return self._hash_cache[key]
         
     def generate_test_cases(self):
         """Generate all test cases according to specifications"""
@@ -129,33 +394,40 @@ class TestReport:
         if waguri_png.exists():
             # Test with minimal capacity (n-LSB=1, no random start to maximize capacity)
             self.test_cases.append(
-                TestCase("Capacity Test: waguri.png (Expected to FAIL)", 
-                        str(self.cover_audio), str(waguri_png), False, False, 1, scenario="Scenario 2")
+                TestCase("Capacity Test: waguri.png (Expected to FAIL)",
+                        str(self.cover_audio), str(waguri_png), False, False, 1, scenario="Scenario 2",
+                        expected_failure=True)
             )
         
         # Scenario 3: Various file types with random configurations
         print("[Scenario 3] Various file types with randomized configurations")
         test_files = [
-            self.tests_dir / "sample_secret.txt",
-            self.tests_dir / "waguri.png",
-            self.tests_dir / "waguri.webp",
-            self.tests_dir / "blokchein.pdf",
-            self.tests_dir / "wagureng.zip",
+            f for f in (
+                self.tests_dir / "sample_secret.txt",
+                self.tests_dir / "waguri.png",
+                self.tests_dir / "waguri.webp",
+                self.tests_dir / "blokchein.pdf",
+                self.tests_dir / "wagureng.zip",
+            )
+            if f.exists()
         ]
-        
-        # Add any additional files found in tests directory
-        for file_path in self.tests_dir.glob("*"):
-            if file_path.is_file() and file_path.suffix not in ['.mp3'] and file_path not in test_files:
-                test_files.append(file_path)
-        
-        # Filter existing files
-        test_files = [f for f in test_files if f.exists()]
-        
+
+        # Add any additional files found in tests directory; os.scandir
+        # membawa tipe entri dari satu syscall, tanpa stat ulang per file
+        known = {f.name for f in test_files}
+        with os.scandir(self.tests_dir) as entries:
+            for entry in entries:
+                if (entry.is_file() and not entry.name.endswith('.mp3')
+                        and entry.name not in known):
+                    test_files.append(self.tests_dir / entry.name)
+
         for test_file in test_files:
-            # Random configuration for each file type
-            use_enc = random.choice([True, False])
-            use_rand = random.choice([True, False])
-            nlsb = random.randint(2, 4)  # Use 2-4 for better capacity
+            # Konfigurasi acak tapi deterministik per nama file: seed string
+            # di-hash via SHA-512 oleh random.Random, stabil antar run/proses
+            rng = random.Random(f"{test_file.name}:scenario3")
+            use_enc = rng.choice([True, False])
+            use_rand = rng.choice([True, False])
+            nlsb = rng.randint(2, 4)  # Use 2-4 for better capacity
             
             test_name = f"Random Config: {test_file.suffix} - Enc={use_enc}, Rand={use_rand}, n-LSB={nlsb}"
             self.test_cases.append(
@@ -167,115 +439,34 @@ class TestReport:
     
     def run_test(self, test_case: TestCase):
         """Run a single test case"""
-        print(f"\nRunning: {test_case.name}")
-        print(f"  Secret file: {os.path.basename(test_case.secret_file)}")
-        print(f"  Config: Encryption={test_case.use_encryption}, Random={test_case.use_random}, n-LSB={test_case.nlsb}")
-        
-        start_time = time.time()
-        
-        # Generate unique output file names
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-        stego_file = self.output_dir / f"stego_{timestamp}.mp3"
-        
-        # Get original file size
-        test_case.file_size = get_file_size(test_case.secret_file)
-        
-        # Generate key for encryption/random start
-        key = f"testkey_{timestamp}"
-        
-        try:
-            # Calculate original hash
-            test_case.original_hash = calculate_md5(test_case.secret_file)
-            
-            # Embed
-            print("  Embedding...")
-            self.stego.embed_file(
-                mp3_path=test_case.cover_file,
-                payload_path=test_case.secret_file,
-                out_path=str(stego_file),
-                key=key,
-                nlsb=test_case.nlsb,
-                encrypt=test_case.use_encryption,
-                random_start=test_case.use_random
-            )
-            
-            # Calculate PSNR
-            import numpy as np
-            with open(test_case.cover_file, "rb") as f:
-                original_bytes = f.read()
-            with open(str(stego_file), "rb") as f:
-                stego_bytes = f.read()
-            L = min(len(original_bytes), len(stego_bytes))
-            if L == 0:
-                psnr = float("inf")
-            else:
-                diff = np.frombuffer(original_bytes[:L], dtype=np.uint8).astype(
-                    np.int32
-                ) - np.frombuffer(stego_bytes[:L], dtype=np.uint8).astype(np.int32)
-                mse = float(np.mean(diff * diff)) if L > 0 else 0.0
-                psnr = (
-                    float("inf")
-                    if mse == 0
-                    else 10.0 * np.log10((255.0 * 255.0) / mse)
-                )
-            test_case.psnr = f"{psnr:.2f} dB"
-            
-            # Extract
-            print("  Extracting...")
-            extracted_path, size_bytes, status = self.stego.extract_file(
-                mp3_path=str(stego_file),
-                out_path=str(self.extracted_dir),
-                key=key,
-                restore_meta=True
-            )
-            
-            # Calculate extracted hash
-            test_case.extracted_hash = calculate_md5(extracted_path)
-            
-            # Check integrity
-            if test_case.original_hash == test_case.extracted_hash:
-                test_case.integrity = "✓ MATCH"
-                test_case.result = "SUCCESS"
-                print(f"  ✓ Test PASSED - Integrity verified")
-            else:
-                test_case.integrity = "✗ MISMATCH"
-                test_case.result = "FAILED"
-                test_case.error_message = "Hash mismatch"
-                print(f"  ✗ Test FAILED - Hash mismatch")
-            
-            # Cleanup stego file
-            try:
-                os.remove(stego_file)
-            except:
-                pass
-                
-        except Exception as e:
-            test_case.result = "ERROR"
-            test_case.integrity = "N/A"
-            test_case.error_message = str(e)[:100]  # Limit error message length
-            print(f"  ✗ Test ERROR: {test_case.error_message}")
-            
-            # Cleanup on error
-            try:
-                if stego_file.exists():
-                    os.remove(stego_file)
-            except:
-                pass
-        
-        test_case.execution_time = time.time() - start_time
-        print(f"  Execution time: {test_case.execution_time:.2f}s")
-    
+        run_single_test(self.stego, test_case, self.output_dir, self.extracted_dir)
+
     def run_all_tests(self):
-        """Run all test cases"""
+        """Run all test cases in parallel worker processes"""
         print(f"\n{'='*80}")
         print(f"Starting Test Execution")
         print(f"{'='*80}")
-        
-        total = len(self.test_cases)
-        for idx, test_case in enumerate(self.test_cases, 1):
-            print(f"\n[Test {idx}/{total}]")
-            self.run_test(test_case)
-        
+
+        # Hash + ukuran file rahasia dihitung sekali di induk sebelum
+        # dispatch — worker tidak menghash ulang file yang dipakai bersama
+        for test_case in self.test_cases:
+            try:
+                test_case.original_hash = self._cached_hash(test_case.secret_file)
+                test_case.file_size = get_file_size(test_case.secret_file)
+            except OSError:
+                pass  # biarkan worker melaporkan error-nya sendiri
+
+        # Tiap test case independen (file stego unik per test), jadi suite
+        # dibagi ke pool proses; output print antar worker bisa interleave
+        workers = min(len(self.test_cases), os.cpu_count() or 1)
+        args = [
+            (test_case, self.output_dir, self.extracted_dir)
+            for test_case in self.test_cases
+        ]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            self.test_cases = list(executor.map(_run_test_worker, args))
+        self.scenarios = self._group_by_scenario()
+
         print(f"\n{'='*80}")
         print(f"All Tests Completed")
         print(f"{'='*80}")
@@ -286,107 +477,118 @@ class TestReport:
         
         # Calculate statistics
         total_tests = len(self.test_cases)
-        success_count = sum(1 for t in self.test_cases if t.result == "SUCCESS")
-        failed_count = sum(1 for t in self.test_cases if t.result == "FAILED")
-        error_count = sum(1 for t in self.test_cases if t.result == "ERROR")
-        
-        with open(report_file, 'w', encoding='utf-8') as f:
-            # Header
-            f.write("="*100 + "\n")
-            f.write(" "*30 + "AUDIO STEGANOGRAPHY TEST REPORT\n")
-            f.write("="*100 + "\n\n")
-            
-            f.write(f"Report Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Cover Audio: {self.cover_audio.name}\n")
-            f.write(f"Total Tests: {total_tests}\n\n")
-            
-            # Summary Statistics
-            f.write("-"*100 + "\n")
-            f.write("TEST SUMMARY\n")
-            f.write("-"*100 + "\n")
-            f.write(f"✓ SUCCESS: {success_count} ({success_count/total_tests*100:.1f}%)\n")
-            f.write(f"✗ FAILED:  {failed_count} ({failed_count/total_tests*100:.1f}%)\n")
-            f.write(f"⚠ ERROR:   {error_count} ({error_count/total_tests*100:.1f}%)\n")
-            f.write("-"*100 + "\n\n")
-            
-            # Detailed Results Table - Separated by Scenario
-            f.write("="*130 + "\n")
-            f.write("DETAILED TEST RESULTS\n")
-            f.write("="*130 + "\n\n")
-            
-            # Group tests by scenario
-            scenarios = {}
-            for test in self.test_cases:
-                scenario = test.scenario if test.scenario else "Other"
-                if scenario not in scenarios:
-                    scenarios[scenario] = []
-                scenarios[scenario].append(test)
-            
-            # Print each scenario separately
-            for scenario_name in ["Scenario 1", "Scenario 2", "Scenario 3"]:
-                if scenario_name not in scenarios:
-                    continue
-                    
-                f.write(f"\n{scenario_name.upper()}\n")
-                f.write("-"*130 + "\n")
-                
-                # Table header
-                f.write(f"{'No':<4} {'Test Name':<45} {'File':<18} {'Size':<10} {'Enc':<4} {'Rnd':<4} {'LSB':<4} {'PSNR':<12} {'Result':<9} {'Integrity':<11} {'Time':<7}\n")
-                f.write("-"*130 + "\n")
-                
-                # Table rows
-                scenario_tests = scenarios[scenario_name]
-                for idx, test in enumerate(scenario_tests, 1):
-                    data = test.to_dict()
-                    test_name = data['name'][:43]  # Truncate if too long
-                    secret_file = os.path.basename(test.secret_file)[:16]
-                    
-                    f.write(f"{idx:<4} {test_name:<45} {secret_file:<18} {data['file_size']:<10} "
-                           f"{data['encryption']:<4} {data['random_start']:<4} {data['nlsb']:<4} "
-                           f"{data['psnr']:<12} {data['result']:<9} {data['integrity']:<11} {data['execution_time']:<7}\n")
-                
-                f.write("-"*130 + "\n")
-            
-            f.write("\n")
-            
-            # Errors Details
-            if error_count > 0:
-                f.write("="*100 + "\n")
-                f.write("ERROR DETAILS\n")
-                f.write("="*100 + "\n\n")
-                
-                for idx, test in enumerate(self.test_cases, 1):
-                    if test.result in ["ERROR", "FAILED"]:
-                        f.write(f"[Test {idx}] {test.name}\n")
-                        f.write(f"  File: {os.path.basename(test.secret_file)}\n")
-                        f.write(f"  Status: {test.result}\n")
-                        f.write(f"  Error: {test.error_message}\n\n")
-            
-            # Configuration Analysis
-            f.write("="*100 + "\n")
-            f.write("CONFIGURATION ANALYSIS\n")
-            f.write("="*100 + "\n\n")
-            
-            # Success rate by configuration
-            configs = {}
-            for test in self.test_cases:
-                config_key = f"Enc={test.use_encryption}, Rand={test.use_random}, LSB={test.nlsb}"
-                if config_key not in configs:
-                    configs[config_key] = {'total': 0, 'success': 0}
-                configs[config_key]['total'] += 1
-                if test.result == "SUCCESS":
-                    configs[config_key]['success'] += 1
-            
-            f.write(f"{'Configuration':<40} {'Tests':<10} {'Success':<10} {'Rate':<10}\n")
-            f.write("-"*70 + "\n")
-            for config, stats in sorted(configs.items()):
-                rate = stats['success'] / stats['total'] * 100 if stats['total'] > 0 else 0
-                f.write(f"{config:<40} {stats['total']:<10} {stats['success']:<10} {rate:.1f}%\n")
-            
-            f.write("\n" + "="*100 + "\n")
-            f.write("END OF REPORT\n")
-            f.write("="*100 + "\n")
+        result_counts = Counter(t.result for t in self.test_cases)
+        success_count = result_counts["SUCCESS"]
+        failed_count = result_counts["FAILED"]
+        error_count = result_counts["ERROR"]
         
+        # Susun seluruh laporan sebagai list string dan tulis sekali:
+        # satu encoding + satu write, bukan ratusan panggilan f.write
+        parts = []
+        # Header
+        parts.append("="*100 + "\n")
+        parts.append(" "*30 + "AUDIO STEGANOGRAPHY TEST REPORT\n")
+        parts.append("="*100 + "\n\n")
+
+        parts.append(f"Report Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        parts.append(f"Cover Audio: {self.cover_audio.name}\n")
+        parts.append(f"Total Tests: {total_tests}\n\n")
+
+        # Summary Statistics
+        parts.append("-"*100 + "\n")
+        parts.append("TEST SUMMARY\n")
+        parts.append("-"*100 + "\n")
+        parts.append(f"✓ SUCCESS: {success_count} ({success_count/total_tests*100:.1f}%)\n")
+        parts.append(f"✗ FAILED:  {failed_count} ({failed_count/total_tests*100:.1f}%)\n")
+        parts.append(f"⚠ ERROR:   {error_count} ({error_count/total_tests*100:.1f}%)\n")
+        parts.append("-"*100 + "\n\n")
+
+        # Detailed Results Table - Separated by Scenario
+        parts.append("="*130 + "\n")
+        parts.append("DETAILED TEST RESULTS\n")
+        parts.append("="*130 + "\n\n")
+
+        # Group tests by scenario (sekali per suite)
+        scenarios = self.scenarios or self._group_by_scenario()
+
+        # Print each scenario separately
+        for scenario_name in ["Scenario 1", "Scenario 2", "Scenario 3"]:
+            if scenario_name not in scenarios:
+                continue
+
+            parts.append(f"\n{scenario_name.upper()}\n")
+            parts.append("-"*130 + "\n")
+
+            # Table header
+            parts.append(_DETAIL_ROW.format(
+                no='No', name='Test Name', file='File', size='Size',
+                enc='Enc', rnd='Rnd', lsb='LSB', psnr='PSNR',
+                result='Result', integ='Integrity', time='Time'))
+            parts.append("-"*130 + "\n")
+
+            # Table rows (template modul diparse sekali, bukan per f-string
+            # di tiap iterasi)
+            scenario_tests = scenarios[scenario_name]
+            for idx, test in enumerate(scenario_tests, 1):
+                data = test.to_dict()
+                parts.append(_detail_fmt(
+                    no=idx,
+                    name=data['name'][:43],  # Truncate if too long
+                    file=test.secret_name[:16],
+                    size=data['file_size'],
+                    enc=data['encryption'],
+                    rnd=data['random_start'],
+                    lsb=data['nlsb'],
+                    psnr=data['psnr'],
+                    result=data['result'],
+                    integ=data['integrity'],
+                    time=data['execution_time']))
+
+            parts.append("-"*130 + "\n")
+
+        parts.append("\n")
+
+        # Errors Details
+        if error_count > 0:
+            parts.append("="*100 + "\n")
+            parts.append("ERROR DETAILS\n")
+            parts.append("="*100 + "\n\n")
+
+            for idx, test in enumerate(self.test_cases, 1):
+                if test.result in ["ERROR", "FAILED"]:
+                    parts.append(f"[Test {idx}] {test.name}\n")
+                    parts.append(f"  File: {test.secret_name}\n")
+                    parts.append(f"  Status: {test.result}\n")
+                    parts.append(f"  Error: {test.error_message}\n\n")
+
+        # Configuration Analysis
+        parts.append("="*100 + "\n")
+        parts.append("CONFIGURATION ANALYSIS\n")
+        parts.append("="*100 + "\n\n")
+
+        # Success rate by configuration: Counter dengan kunci tuple, string
+        # label hanya diformat sekali per konfigurasi saat ditulis
+        totals, successes = Counter(), Counter()
+        for test in self.test_cases:
+            k = (test.use_encryption, test.use_random, test.nlsb)
+            totals[k] += 1
+            if test.result == "SUCCESS":
+                successes[k] += 1
+
+        parts.append(f"{'Configuration':<40} {'Tests':<10} {'Success':<10} {'Rate':<10}\n")
+        parts.append("-"*70 + "\n")
+        for (enc, rand, nlsb), total in sorted(totals.items()):
+            success = successes[(enc, rand, nlsb)]
+            rate = success / total * 100 if total > 0 else 0
+            config = f"Enc={enc}, Rand={rand}, LSB={nlsb}"
+            parts.append(f"{config:<40} {total:<10} {success:<10} {rate:.1f}%\n")
+
+        parts.append("\n" + "="*100 + "\n")
+        parts.append("END OF REPORT\n")
+        parts.append("="*100 + "\n")
+
+        report_file.write_text("".join(parts), encoding='utf-8')
+
         print(f"\n✓ Test report saved to: {report_file}")
         return report_file
     
@@ -396,14 +598,9 @@ class TestReport:
         print("TEST RESULTS SUMMARY TABLE")
         print(f"{'='*130}\n")
         
-        # Group tests by scenario
-        scenarios = {}
-        for test in self.test_cases:
-            scenario = test.scenario if test.scenario else "Other"
-            if scenario not in scenarios:
-                scenarios[scenario] = []
-            scenarios[scenario].append(test)
-        
+        # Group tests by scenario (sekali per suite)
+        scenarios = self.scenarios or self._group_by_scenario()
+
         # Print each scenario separately
         for scenario_name in ["Scenario 1", "Scenario 2", "Scenario 3"]:
             if scenario_name not in scenarios:
@@ -417,7 +614,7 @@ class TestReport:
             scenario_tests = scenarios[scenario_name]
             for idx, test in enumerate(scenario_tests, 1):
                 test_name = test.name[:38]
-                file_ext = Path(test.secret_file).suffix[:10]
+                file_ext = test.secret_suffix[:10]
                 config = f"E={int(test.use_encryption)}|R={int(test.use_random)}|L={test.nlsb}"
                 
                 print(f"{idx:<4} {test_name:<40} {file_ext:<12} {config:<20} {test.psnr:<12} {test.result:<10} {test.integrity:<12}")
@@ -426,9 +623,10 @@ class TestReport:
         
         # Overall Statistics
         total = len(self.test_cases)
-        success = sum(1 for t in self.test_cases if t.result == "SUCCESS")
-        failed = sum(1 for t in self.test_cases if t.result == "FAILED")
-        error = sum(1 for t in self.test_cases if t.result == "ERROR")
+        result_counts = Counter(t.result for t in self.test_cases)
+        success = result_counts["SUCCESS"]
+        failed = result_counts["FAILED"]
+        error = result_counts["ERROR"]
         
         print(f"\n{'='*130}")
         print(f"OVERALL STATISTICS")
@@ -449,7 +647,7 @@ def main():
     print("  2. Capacity overflow test with waguri.png")
     print("  3. Various file types (.txt, .png, .pdf, .zip, .webp, etc.) with random configs")
     print()
-    print("Integrity Check: MD5 hash comparison (original vs extracted)")
+    print("Integrity Check: BLAKE2b hash comparison (original vs extracted)")
     print("Cover Audio: cover.mp3")
     print()
     